@@ -0,0 +1,111 @@
+"""
+Deterministic LangChain chat model for offline benchmarks.
+
+It reads the "Field requirements" section of the prompt and answers with a
+JSON object that fills every listed field, after a configurable delay. The
+streaming path emits small chunks spread across the same delay.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_FIELD_LINE = re.compile(r"^\* (?P<name>.+?) \(required=(?:True|False)\)(?: one of: (?P<allowed>.*))?$", re.M)
+_rng = random.Random(7)
+# provider-style prefix cache: prompts are cached in 512-char (~128 token) blocks
+_PREFIX_BLOCK = 512
+_seen_prefixes: set = set()
+_seen_lock = threading.Lock()
+_REQUIREMENT = re.compile(r"New \w+ requirement: (?P<text>.*)")
+_STORIES = re.compile(r'Also return "stories": a list of up to (?P<n>\d+)')
+
+
+class FakeEpicChatModel(BaseChatModel):
+    delay: float = 0.5                 # seconds until the whole answer is available
+    first_token_delay: float = 0.15    # streaming: time to first chunk
+    chunk_chars: int = 6
+    # tail / fault injection for router benchmarks: a share of calls is slow or answers garbage
+    tail_rate: float = 0.0
+    tail_delay: float = 0.0
+    garbage_rate: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-epic"
+
+    def answer(self, messages: List[BaseMessage]) -> str:
+        prompt = str(messages[-1].content)
+        match = _REQUIREMENT.search(prompt)
+        requirement = match["text"] if match else "Benchmark epic"
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        out: dict[str, Any] = {}
+        for m in _FIELD_LINE.finditer(prompt):
+            name, allowed = m["name"], m["allowed"]
+            low = name.lower()
+            if allowed:
+                options = [o.strip() for o in allowed.split(",") if o.strip()]
+                out[name] = options[int(digest[:2], 16) % len(options)]
+            elif low == "summary":
+                out[name] = requirement[:80]
+            elif low == "description":
+                out[name] = f"{requirement}\n\nGoals, scope and acceptance criteria ({digest[:8]})."
+            elif low == "labels":
+                out[name] = ["bench", digest[:6]]
+            elif "date" in low:
+                out[name] = "2025-09-30"
+            else:
+                out[name] = f"{name} value {digest[:4]}"
+        stories = _STORIES.search(prompt)
+        if stories:
+            out["stories"] = [f"{requirement[:60]} – part {n + 1}" for n in range(int(stories["n"]))]
+        out.setdefault("summary", requirement[:80])
+        out.setdefault("description", requirement)
+        return json.dumps(out)
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> dict:
+        prompt = "\n".join(str(m.content) for m in messages)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(text) // 4
+        cached = 0
+        with _seen_lock:
+            for end in range(_PREFIX_BLOCK, len(prompt) + 1, _PREFIX_BLOCK):
+                digest = hashlib.sha256(prompt[:end].encode()).digest()
+                if digest in _seen_prefixes:
+                    cached = end
+                _seen_prefixes.add(digest)
+        return {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "input_token_details": {"cache_read": cached // 4}}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = self.answer(messages)
+        roll = _rng.random()
+        time.sleep(self.delay + (self.tail_delay if roll < self.tail_rate else 0.0))
+        if _rng.random() < self.garbage_rate:
+            text = "Sorry, I cannot help with that."
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text = self.answer(messages)
+        if self.garbage_rate and _rng.random() < self.garbage_rate:
+            text = "Sorry, I cannot help with that."
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        time.sleep(self.first_token_delay)
+        per_chunk = max(0.0, self.delay - self.first_token_delay) / max(1, len(chunks))
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(per_chunk)
+            usage = self._usage(messages, text) if i == len(chunks) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk, usage_metadata=usage))
@@ -0,0 +1,62 @@
+"""
+Import-time budget check for epic_creator.
+
+Imports each entry module in a fresh interpreter, takes the best of a few runs
+of ``-X importtime`` and fails (exit 1) if a module goes over its budget or
+drags in a dependency that is supposed to load lazily.
+
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --scale 2     # slower CI machine
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# module → (budget in ms, modules that must not be imported with it)
+BUDGETS = {
+    "epic_creator.cli":                  (50,  ("requests", "langchain_core", "dotenv", "numpy")),
+    "epic_creator.config":               (20,  ("dotenv",)),
+    "epic_creator.jiraClient":           (300, ("langchain_core", "dotenv", "pydantic")),
+    "epic_creator.services.field_meta":  (300, ("langchain_core", "dotenv")),
+    "epic_creator.services.llm":         (400, ("langchain_core", "langchain_openai", "tiktoken")),
+    "epic_creator.orchestrator":         (600, ("langchain_core", "langchain_openai", "dotenv")),
+}
+
+_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S+)\s*$")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    probe = f"import {module}, sys; print(' '.join(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=ROOT / "src",
+                          capture_output=True, text=True, check=True)
+    cumulative = {m[2]: int(m[1]) for m in map(_LINE.match, proc.stderr.splitlines()) if m}
+    return cumulative.get(module, 0) / 1000, set(proc.stdout.split())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    args = ap.parse_args()
+
+    failed = False
+    for module, (budget, forbidden) in BUDGETS.items():
+        samples = [measure(module) for _ in range(args.runs)]
+        best = min(ms for ms, _ in samples)
+        leaked = sorted(f for f in forbidden if any(f in mods for _, mods in samples))
+        limit = budget * args.scale
+        ok = best <= limit and not leaked
+        failed |= not ok
+        note = f"  pulls in {', '.join(leaked)}" if leaked else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<36} {best:7.1f} ms / {limit:5.0f} ms{note}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Local stand-in for the Jira Cloud endpoints epic_creator talks to.
+
+    python benchmarks/jira_standin.py --port 8765 --latency 0.05 --custom-fields 5000
+
+Serves createmeta, field, project, search, myself, issue and issue/bulk with a
+fixed per-request latency. ``GET /__stats`` returns request counts per route,
+``POST /__reset`` clears them.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PRIORITIES = [{"id": str(i), "name": n} for i, n in enumerate(["Highest", "High", "Medium", "Low", "Lowest"], 1)]
+WORDS = ("video image upload pipeline billing invoice login sso mobile push search ranking "
+         "dashboard export report audit admin api webhook cache latency storage sync onboarding").split()
+
+
+class StandinData:
+    """Deterministic payloads, serialised once up front."""
+
+    def __init__(self, custom_fields: int = 200, epics: int = 300, description_chars: int = 1500,
+                 epic_custom_fields: int = 8, seed: int = 7):
+        rng = random.Random(seed)
+        system = [
+            {"id": "summary", "name": "Summary", "schema": {"type": "string", "system": "summary"}},
+            {"id": "description", "name": "Description", "schema": {"type": "string", "system": "description"}},
+            {"id": "project", "name": "Project", "schema": {"type": "project", "system": "project"}},
+            {"id": "issuetype", "name": "Work type", "schema": {"type": "issuetype", "system": "issuetype"}},
+            {"id": "reporter", "name": "Reporter", "schema": {"type": "user", "system": "reporter"}},
+            {"id": "priority", "name": "Priority", "schema": {"type": "priority", "system": "priority"}},
+            {"id": "labels", "name": "Labels", "schema": {"type": "array", "items": "string", "system": "labels"}},
+            {"id": "duedate", "name": "Due date", "schema": {"type": "date", "system": "duedate"}},
+        ]
+        custom = [
+            {"id": f"customfield_{10000 + i}", "name": f"Custom field {i}",
+             "schema": {"type": "string", "custom": "com.atlassian.jira.plugin.system.customfieldtypes:textfield",
+                        "customId": 10000 + i}}
+            for i in range(custom_fields)
+        ]
+        self.fields = system + custom
+
+        epic_fields = [
+            {"fieldId": f["id"], "name": f["name"], "schema": f["schema"],
+             "required": f["id"] in ("summary", "project", "issuetype", "reporter")}
+            for f in system
+        ]
+        epic_fields[5]["allowedValues"] = PRIORITIES
+        epic_fields += [
+            {"fieldId": f["id"], "name": f["name"], "schema": f["schema"], "required": False}
+            for f in custom[:epic_custom_fields]
+        ]
+        self.createmeta_types = json.dumps({"issueTypes": [
+            {"id": "10001", "name": "Story"}, {"id": "10000", "name": "Epic"}, {"id": "10002", "name": "Bug"},
+        ]}).encode()
+        self.createmeta_epic = json.dumps({"fields": epic_fields, "total": len(epic_fields)}).encode()
+        self.createmeta_story = json.dumps({"fields": epic_fields[:8], "total": 8}).encode()
+        self.field_catalogue = json.dumps(self.fields).encode()
+        self.myself = json.dumps({"accountId": "557058:standin", "displayName": "Bench User"}).encode()
+
+        self.epics = []
+        for i in range(epics):
+            words = rng.sample(WORDS, 4)
+            self.epics.append({
+                "id": str(20000 + i), "key": f"BENCH-{i + 1}",
+                "fields": {
+                    "summary": " ".join(words).capitalize(),
+                    "description": " ".join(rng.choice(WORDS) for _ in range(description_chars // 7)),
+                    "labels": words[:2],
+                    "created": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00.000+0000",
+                    "updated": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00.000+0000",
+                },
+            })
+
+    def project(self, key: str) -> bytes:
+        return json.dumps({"key": key, "name": f"{key} project",
+                           "description": "Stand-in project used for offline benchmarks.",
+                           "lead": {"displayName": "Bench Lead"}}).encode()
+
+    def search(self, params) -> bytes:
+        start = int(params.get("startAt", ["0"])[0])
+        limit = int(params.get("maxResults", ["50"])[0])
+        jql = params.get("jql", [""])[0]
+        issues = self.epics
+        if "ORDER BY created DESC" in jql:
+            issues = sorted(issues, key=lambda e: e["fields"]["created"], reverse=True)
+        return json.dumps({"startAt": start, "maxResults": limit, "total": len(issues),
+                           "issues": issues[start:start + limit]}).encode()
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data: StandinData, latency: float = 0.0):
+        super().__init__(address, _Handler)
+        self.data = data
+        self.latency = latency
+        self.counts: Counter = Counter()
+        self.counts_lock = threading.Lock()
+        self.next_issue = 1000
+
+    def handle_error(self, request, client_address) -> None:
+        # streaming clients hang up once they have what they need
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+_ROUTES = [
+    ("GET", re.compile(r"^/rest/api/3/issue/createmeta/[^/]+/issuetypes$"), "createmeta.issuetypes"),
+    ("GET", re.compile(r"^/rest/api/3/issue/createmeta/[^/]+/issuetypes/(\d+)$"), "createmeta.issuetype"),
+    ("GET", re.compile(r"^/rest/api/3/field$"), "field"),
+    ("GET", re.compile(r"^/rest/api/2/project/([^/]+)$"), "project"),
+    ("GET", re.compile(r"^/rest/api/2/search$"), "search"),
+    ("GET", re.compile(r"^/rest/api/3/myself$"), "myself"),
+    ("POST", re.compile(r"^/rest/api/2/issue$"), "issue"),
+    ("POST", re.compile(r"^/rest/api/2/issue/bulk$"), "issue.bulk"),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandinServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:      # keep benchmark output clean
+        pass
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, method: str):
+        url = urlparse(self.path)
+        for m, pattern, name in _ROUTES:
+            match = pattern.match(url.path) if m == method else None
+            if match:
+                return name, match, parse_qs(url.query)
+        return None, None, None
+
+    def do_GET(self) -> None:
+        if self.path == "/__stats":
+            with self.server.counts_lock:
+                return self._send(200, json.dumps(dict(self.server.counts)).encode())
+        name, match, params = self._route("GET")
+        if name is None:
+            return self._send(404, b'{"errorMessages":["not found"]}')
+        self._count_and_wait(name)
+        data = self.server.data
+        if name == "createmeta.issuetypes":
+            body = data.createmeta_types
+        elif name == "createmeta.issuetype":
+            body = data.createmeta_epic if match.group(1) == "10000" else data.createmeta_story
+        elif name == "field":
+            body = data.field_catalogue
+        elif name == "project":
+            body = data.project(match.group(1))
+        elif name == "search":
+            body = data.search(params)
+        else:
+            body = data.myself
+        self._send(200, body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/__reset":
+            with self.server.counts_lock:
+                self.server.counts.clear()
+            return self._send(200, b"{}")
+        name, _, _ = self._route("POST")
+        if name is None:
+            return self._send(404, b'{"errorMessages":["not found"]}')
+        self._count_and_wait(name)
+        updates = payload.get("issueUpdates") if name == "issue.bulk" else [payload]
+        issues = []
+        with self.server.counts_lock:
+            for _ in updates:
+                self.server.next_issue += 1
+                n = self.server.next_issue
+                issues.append({"id": str(n), "key": f"BENCH-{n}", "self": f"/rest/api/2/issue/{n}"})
+        body = {"issues": issues, "errors": []} if name == "issue.bulk" else issues[0]
+        self._send(201, json.dumps(body).encode())
+
+    def _count_and_wait(self, name: str) -> None:
+        with self.server.counts_lock:
+            self.server.counts[name] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+
+def serve(port: int = 0, latency: float = 0.0, **data_kwargs) -> StandinServer:
+    """Start the stand-in on a background thread; ``server.server_address[1]`` is the port."""
+    server = StandinServer(("127.0.0.1", port), StandinData(**data_kwargs), latency)
+    threading.Thread(target=server.serve_forever, name="jira-standin", daemon=True).start()
+    return server
+
+
+def _serve_in_process(port_queue, latency: float, data_kwargs: dict) -> None:
+    server = StandinServer(("127.0.0.1", 0), StandinData(**data_kwargs), latency)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.05, help="seconds added to every request")
+    ap.add_argument("--custom-fields", type=int, default=200)
+    ap.add_argument("--epics", type=int, default=300)
+    ap.add_argument("--description-chars", type=int, default=1500)
+    args = ap.parse_args()
+    srv = StandinServer(("127.0.0.1", args.port),
+                        StandinData(args.custom_fields, args.epics, args.description_chars), args.latency)
+    print(f"Jira stand-in on http://127.0.0.1:{srv.server_address[1]}")
+    srv.serve_forever()
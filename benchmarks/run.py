@@ -0,0 +1,275 @@
+"""
+Offline end-to-end benchmark for epic_creator.
+
+Runs the orchestrator, the Streamlit draft path and a batch import against a
+local Jira stand-in and a deterministic fake chat model, then reports per-stage
+p50/p95 latency, Jira request counts and peak Python memory.
+
+    python benchmarks/run.py --iterations 20 --latency 0.05 --custom-fields 5000
+    python benchmarks/run.py --out before.json           # on the old commit
+    python benchmarks/run.py --compare before.json        # on the new one
+
+The first iteration of every scenario runs with empty caches ("cold"); the
+rest are warm. Prompts differ per iteration so the LLM cache is not hit.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+# ───────────────────────────── timing helpers ─────────────────────────────
+class StageTimer:
+    """Trace sink that buckets span durations per stage / Jira route / model."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stage_of(span: Any) -> str:
+        attrs = span.attrs
+        if span.name == "stage":
+            return f"stage.{attrs.get('stage')}"
+        if span.name == "jira.request":
+            return f"jira {attrs.get('method')} {attrs.get('path')}"
+        return span.name
+
+    def emit(self, span: Any) -> None:
+        with self._lock:
+            self.samples[self.stage_of(span)].append(span.duration)
+            self.retries += span.attrs.get("retries") or 0
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+            self.retries = 0
+
+
+def summarise(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {"n": len(ordered), "p50": round(statistics.median(ordered), 4), "p95": round(pick(0.95), 4)}
+
+
+def standin_stats(base_url: str, reset: bool = False) -> Dict[str, int]:
+    if reset:
+        urllib.request.urlopen(urllib.request.Request(f"{base_url}/__reset", data=b"{}", method="POST")).read()
+        return {}
+    return json.loads(urllib.request.urlopen(f"{base_url}/__stats").read())
+
+
+# ───────────────────────────── scenarios ──────────────────────────────────
+def build_scenarios(args: argparse.Namespace, timer: StageTimer) -> Dict[str, Callable[[int], None]]:
+    from fake_llm import FakeEpicChatModel
+    from epic_creator import batch, decompose, orchestrator
+    from epic_creator.jiraClient import JiraClient
+    from epic_creator.services.llm import LLMService
+    from epic_creator.services.llm_cache import LLMResultCache
+
+    jira = JiraClient()
+    fake_kwargs = dict(delay=args.llm_delay, first_token_delay=args.llm_first_token,
+                       tail_rate=args.llm_tail_rate, tail_delay=args.llm_tail_delay)
+    if args.hedge:
+        from epic_creator.services.llm_router import ModelRoute, ModelRouter
+        router = ModelRouter([ModelRoute("primary", FakeEpicChatModel(**fake_kwargs)),
+                              ModelRoute("secondary", FakeEpicChatModel(**fake_kwargs))], min_samples=5)
+        llm_service = LLMService(router=router, cache=LLMResultCache())
+    else:
+        llm_service = LLMService(llm=FakeEpicChatModel(**fake_kwargs), cache=LLMResultCache())
+
+    def orchestrator_run(i: int) -> None:
+        orchestrator.create_epic_from_prompt(
+            "BENCH", f"Build an image-to-video generation tool, variant {i}",
+            jira=jira, llm_service=llm_service,
+        )
+
+    def draft_run(i: int) -> None:
+        start = time.perf_counter()
+        drafts, _, _ = orchestrator.stream_draft(
+            jira, "BENCH", f"Add SSO login for enterprise tenants, variant {i}", llm_service=llm_service,
+        )
+        first = None
+        for _ in drafts:
+            if first is None:
+                first = time.perf_counter() - start
+        timer.record("draft.first_partial", first or 0.0)
+
+    def batch_run(i: int) -> None:
+        rows = [batch.BatchRow("BENCH", f"Roadmap item {i}-{n}: improve search ranking") for n in range(args.batch_rows)]
+        results = batch.create_epics_in_bulk(rows, jira=jira, llm_service=llm_service, concurrency=args.batch_concurrency)
+        failed = [r for r in results if not r.ok]
+        if failed:
+            raise RuntimeError(f"{len(failed)} batch rows failed, first: {failed[0].error}")
+
+    def breakdown_run(i: int) -> None:
+        result = decompose.decompose_epic(
+            "BENCH", f"Offline mode for the mobile app, variant {i}", jira=jira, llm_service=llm_service,
+            max_stories=args.breakdown_stories, create=True,
+        )
+        failed = [s for s in result.stories if not s.ok]
+        if failed or not result.epic_key:
+            raise RuntimeError(f"breakdown failed: epic {result.epic_key}, first story error: "
+                               f"{failed[0].error if failed else None}")
+
+    return {"orchestrator": orchestrator_run, "draft": draft_run, "batch": batch_run, "breakdown": breakdown_run}
+
+
+def run_scenario(name: str, fn: Callable[[int], None], iterations: int, timer: StageTimer,
+                 base_url: str) -> Dict[str, Any]:
+    from epic_creator.services import epic_index, epic_store, metadata_cache
+
+    # cold start: fresh on-disk caches, empty in-process singletons
+    os.environ["EPIC_CREATOR_CACHE_DIR"] = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    metadata_cache._default_cache = None
+    epic_store._default_store = None
+    epic_index.default_registry._indexes.clear()
+
+    timer.reset()
+    standin_stats(base_url, reset=True)
+    tracemalloc.start()
+    totals: List[float] = []
+    cold = 0.0
+    for i in range(iterations):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(i)
+        elapsed = time.perf_counter() - start
+        if i == 0:
+            cold = elapsed
+        else:
+            totals.append(elapsed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    requests = standin_stats(base_url)
+
+    return {
+        "cold_s": round(cold, 4),
+        "warm": summarise(totals) if totals else None,
+        "stages": {stage: summarise(s) for stage, s in sorted(timer.samples.items())},
+        "requests_total": requests,
+        "requests_per_run": round(sum(requests.values()) / iterations, 2),
+        "retries": timer.retries,
+        "peak_mem_mb": round(peak / 2**20, 2),
+    }
+
+
+# ───────────────────────────── reporting ──────────────────────────────────
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"commit {result['commit']}  config {json.dumps(result['config'])}")
+    for name, sc in result["scenarios"].items():
+        warm = sc["warm"] or {"p50": 0, "p95": 0}
+        print(f"\n== {name}: cold {sc['cold_s']:.3f}s  warm p50 {warm['p50']:.3f}s p95 {warm['p95']:.3f}s  "
+              f"{sc['requests_per_run']} req/run  peak {sc['peak_mem_mb']} MB")
+        for stage, s in sc["stages"].items():
+            print(f"   {stage:<40} p50 {s['p50'] * 1000:9.1f} ms   p95 {s['p95'] * 1000:9.1f} ms   n={s['n']}")
+        print(f"   requests: {sc['requests_total']}")
+
+
+def print_comparison(old: Dict[str, Any], new: Dict[str, Any]) -> None:
+    def pct(a: float, b: float) -> str:
+        return f"{(b - a) / a * 100:+6.1f}%" if a else "   n/a"
+
+    print(f"\n== compare {old['commit']} → {new['commit']}")
+    for name, sc in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if not before:
+            continue
+        rows = [("cold", before["cold_s"], sc["cold_s"])]
+        if before.get("warm") and sc.get("warm"):
+            rows += [("warm p50", before["warm"]["p50"], sc["warm"]["p50"]),
+                     ("warm p95", before["warm"]["p95"], sc["warm"]["p95"])]
+        rows += [("req/run", before["requests_per_run"], sc["requests_per_run"]),
+                 ("peak MB", before["peak_mem_mb"], sc["peak_mem_mb"])]
+        for stage, s in sc["stages"].items():
+            if stage in before["stages"]:
+                rows.append((f"{stage} p50", before["stages"][stage]["p50"], s["p50"]))
+        print(f"-- {name}")
+        for label, a, b in rows:
+            print(f"   {label:<30} {a:>10.4f} → {b:>10.4f}  {pct(a, b)}")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", default="orchestrator,draft,batch,breakdown")
+    ap.add_argument("--iterations", type=int, default=10)
+    ap.add_argument("--latency", type=float, default=0.05, help="stand-in latency per request (s)")
+    ap.add_argument("--custom-fields", type=int, default=5000)
+    ap.add_argument("--epics", type=int, default=300)
+    ap.add_argument("--description-chars", type=int, default=1500)
+    ap.add_argument("--llm-delay", type=float, default=0.5)
+    ap.add_argument("--llm-first-token", type=float, default=0.15)
+    ap.add_argument("--llm-tail-rate", type=float, default=0.0, help="share of LLM calls that are slow")
+    ap.add_argument("--llm-tail-delay", type=float, default=2.0, help="extra seconds for a slow call")
+    ap.add_argument("--hedge", action="store_true", help="route the fake model through a hedged 2-route ModelRouter")
+    ap.add_argument("--batch-rows", type=int, default=60)
+    ap.add_argument("--batch-concurrency", type=int, default=8)
+    ap.add_argument("--breakdown-stories", type=int, default=8)
+    ap.add_argument("--out", help="write results as JSON")
+    ap.add_argument("--compare", help="previous results JSON to diff against")
+    args = ap.parse_args()
+
+    from jira_standin import _serve_in_process
+
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    data_kwargs = {"custom_fields": args.custom_fields, "epics": args.epics,
+                   "description_chars": args.description_chars}
+    server = ctx.Process(target=_serve_in_process, args=(port_queue, args.latency, data_kwargs), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=60)}"
+    os.environ.update({"JIRA_BASE_URL": base_url, "JIRA_EMAIL": "bench@example.com", "JIRA_API_TOKEN": "bench"})
+
+    from epic_creator import tracing
+
+    timer = StageTimer()
+    previous_sink = tracing.set_sink(timer)
+    try:
+        scenarios = build_scenarios(args, timer)
+        result = {"commit": git_commit(), "config": vars(args) | {"out": None, "compare": None}, "scenarios": {}}
+        for name in args.scenarios.split(","):
+            result["scenarios"][name] = run_scenario(name, scenarios[name], args.iterations, timer, base_url)
+    finally:
+        tracing.set_sink(previous_sink)
+        server.terminate()
+
+    print_report(result)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2))
+    if args.compare:
+        print_comparison(json.loads(Path(args.compare).read_text()), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+###############################################################################
+# Async client: pooled connections + Retry-After aware rate limiting          #
+###############################################################################
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+from typing import Any
+
+import httpx
+
+from .jiraClient import JiraError
+from .ratelimit import TokenBucket, observe_rate_limit_headers, parse_retry_after, shared_bucket
+
+
+class AsyncJiraClient:
+    """
+    Asyncio sibling of ``JiraClient`` with the same ``get`` / ``post`` surface.
+
+    * one bounded ``httpx`` connection pool per client
+    * a token bucket shared by every client talking to the same site
+    * ``Retry-After`` / ``X-RateLimit-*`` honoured; only transient statuses retried
+    * POSTs only when Jira refused them or the connection never opened (see ``JiraClient.post``)
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        email: str | None = None,
+        api_token: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        limiter: TokenBucket | None = None,
+        max_attempts: int = 5,
+    ):
+        self.base_url = (base_url or os.environ["JIRA_BASE_URL"]).rstrip("/")
+        email = email or os.environ["JIRA_EMAIL"]
+        api_token = api_token or os.environ["JIRA_API_TOKEN"]
+        self.limiter = limiter or shared_bucket(self.base_url)
+        self.max_attempts = max_attempts
+        self._client = httpx.AsyncClient(
+            auth=(email, api_token),
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+
+    async def get(self, path: str, **params: Any) -> Any:
+        return await self._request("GET", path, params=params)
+
+    async def post(self, path: str, payload: dict[str, Any], idempotent: bool = False) -> Any:
+        return await self._request("POST", path, idempotent=idempotent, json=payload)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncJiraClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    # ------------------------------------------------------------------ #
+    async def _request(self, method: str, path: str, idempotent: bool = True, **kwargs: Any) -> Any:
+        url = f"{self.base_url}{path}"
+        for attempt in range(1, self.max_attempts + 1):
+            await self.limiter.acquire_async()
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                sent = not isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt == self.max_attempts or (sent and not idempotent):
+                    raise JiraError(f"{method} {url} → {exc!r}") from exc
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            observe_rate_limit_headers(self.limiter, response.headers)
+            if response.is_success:
+                return response.json() if response.content else None
+
+            error = JiraError(
+                f"{method} {url} → {response.status_code}: {response.text}",
+                status_code=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+            retryable = error.transient if idempotent else error.refused
+            if not retryable or attempt == self.max_attempts:
+                raise error
+            delay = error.retry_after if error.retry_after is not None else self._backoff(attempt)
+            if response.status_code == 429:
+                self.limiter.pause(delay)          # every caller backs off, not just this one
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return min(10.0, 2 ** (attempt - 1)) * (0.5 + random.random() / 2)
@@ -0,0 +1,151 @@
+###############################################################################
+# Batch / roadmap import                                                      #
+###############################################################################
+from __future__ import annotations
+
+import contextvars
+import csv
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from epic_creator.jiraClient import JiraClient, get_default_client
+from epic_creator.services.field_meta    import FieldMetadataService
+from epic_creator.services.metadata_cache import get_default_cache
+from epic_creator.services.context       import FeatureContextService
+from epic_creator.services.epic_store    import get_default_epic_store
+from epic_creator.services.gather        import EpicContext, gather_context
+from epic_creator.services.llm           import LLMService, get_default_llm_service
+from epic_creator.services.epic_handler  import BULK_LIMIT, EpicCreationHandler
+from epic_creator.services.repair        import map_with_repair
+from epic_creator.tracing               import configure_from_env as configure_tracing, span
+
+
+@dataclass
+class BatchRow:
+    project_key: str
+    prompt: str
+
+
+@dataclass
+class BatchResult:
+    row: int
+    project_key: str
+    key: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.key is not None
+
+
+def read_rows_csv(path: str) -> List[BatchRow]:
+    """Spreadsheet export with ``project_key`` and ``prompt`` columns."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        return [
+            BatchRow(r["project_key"].strip(), r["prompt"].strip())
+            for r in csv.DictReader(fh)
+            if r.get("project_key") and r.get("prompt")
+        ]
+
+
+def create_epics_in_bulk(
+    rows: Iterable[BatchRow],
+    jira: JiraClient | None = None,
+    llm_service: LLMService | None = None,
+    concurrency: int = 4,
+    chunk_size: int = BULK_LIMIT,
+) -> List[BatchResult]:
+    """
+    Create one epic per row. Metadata and context are fetched once per project,
+    drafts are generated ``concurrency`` at a time, and mapped payloads are
+    flushed to ``/issue/bulk`` in chunks of ``chunk_size`` while the remaining
+    drafts are still being generated.
+    """
+    rows = list(rows)
+    chunk_size = min(chunk_size, BULK_LIMIT)
+    jira = jira or get_default_client()
+    llm_service = llm_service or get_default_llm_service()
+    field_service = FieldMetadataService(jira, cache=get_default_cache())
+    context_service = FeatureContextService(jira, store=get_default_epic_store(), cache=get_default_cache())
+    handler = EpicCreationHandler(jira, field_service)
+    results = [BatchResult(i, r.project_key) for i, r in enumerate(rows)]
+
+    account_id = field_service.get_user_id()
+    with span("stage", stage="gather", projects=len({r.project_key for r in rows})):
+        contexts, failures = _gather_per_project(
+            field_service, context_service, {r.project_key for r in rows}, concurrency
+        )
+
+    def draft(i: int) -> Dict[str, Any]:
+        row, ctx = rows[i], contexts[rows[i].project_key]
+        with span("stage", stage="draft", project=row.project_key):
+            related = context_service.get_relevant_epics(row.project_key, row.prompt)   # local index, no Jira call
+            # one cached prefix per project: the same recent epics for every row
+            prompt = llm_service.build_budgeted_prompt(ctx.fields, ctx.project_info, ctx.recent_epics, row.prompt,
+                                                       related=related, project_key=row.project_key)
+            epic = llm_service.generate_epic(prompt.text)
+            return map_with_repair(handler, llm_service, epic, ctx.fields, account_id)[0]
+
+    def flush(chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        try:
+            with span("stage", stage="bulk_create", size=len(chunk)):
+                outcome = handler.create_epics_bulk([(rows[i].project_key, payload) for i, payload in chunk])
+        except Exception as exc:           # network failure – the chunk fails, the batch goes on
+            outcome = [{"error": str(exc)}] * len(chunk)
+        for (i, _), res in zip(chunk, outcome):
+            results[i].key, results[i].error = res.get("key"), res.get("error")
+
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="draft") as pool:
+        futures = {}
+        for i, row in enumerate(rows):
+            if row.project_key in failures:
+                results[i].error = failures[row.project_key]
+            else:
+                futures[pool.submit(contextvars.copy_context().run, draft, i)] = i
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                pending.append((i, fut.result()))
+            except Exception as exc:
+                results[i].error = str(exc)
+                continue
+            if len(pending) >= chunk_size:
+                flush(pending)
+                pending = []
+    if pending:
+        flush(pending)
+    return results
+
+
+def _gather_per_project(
+    field_service: FieldMetadataService,
+    context_service: FeatureContextService,
+    project_keys: Iterable[str],
+    concurrency: int,
+) -> Tuple[Dict[str, EpicContext], Dict[str, str]]:
+    contexts: Dict[str, EpicContext] = {}
+    failures: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="project-ctx") as pool:
+        futures = {
+            pool.submit(contextvars.copy_context().run, gather_context, field_service, context_service, pk, False): pk
+            for pk in project_keys
+        }
+        for fut in as_completed(futures):
+            pk = futures[fut]
+            try:
+                contexts[pk] = fut.result()
+            except Exception as exc:
+                failures[pk] = f"context for {pk} failed: {exc}"
+    return contexts, failures
+
+
+if __name__ == "__main__":
+    # python -m epic_creator.batch roadmap.csv
+    from epic_creator.config import load_config
+    load_config()
+    configure_tracing()
+    for res in create_epics_in_bulk(read_rows_csv(sys.argv[1])):
+        print(f"{res.row}\t{res.project_key}\t{res.key or 'ERROR: ' + str(res.error)}")
@@ -0,0 +1,135 @@
+###############################################################################
+# Command-line entry point                                                    #
+###############################################################################
+"""
+    epic-creator draft  PROJ "Let users export invoices as PDF"
+    epic-creator create PROJ "Let users export invoices as PDF"
+    epic-creator breakdown PROJ "Let users export invoices as PDF" --create
+    epic-creator warm-cache PROJ OTHER
+
+Only argparse is imported up front; each subcommand imports what it needs, so
+``--help`` and argument errors return immediately.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import List
+
+
+def _draft(args: argparse.Namespace) -> int:
+    from epic_creator.orchestrator import create_epic_from_prompt
+
+    fields = create_epic_from_prompt(args.project, args.prompt)
+    print(json.dumps(fields, indent=2, default=str))
+    return 0
+
+
+def _create(args: argparse.Namespace) -> int:
+    from epic_creator.jiraClient import get_default_client
+    from epic_creator.orchestrator import create_epic_from_prompt
+
+    key = create_epic_from_prompt(args.project, args.prompt, create=True)
+    print(f"{key}\t{get_default_client().base_url}/browse/{key}")
+    return 0
+
+
+def _breakdown(args: argparse.Namespace) -> int:
+    from epic_creator.decompose import decompose_epic
+
+    result = decompose_epic(args.project, args.prompt, max_stories=args.max_stories,
+                            concurrency=args.concurrency, create=args.create)
+    if not args.create:
+        print(json.dumps({"epic": result.epic, "stories": [s.fields for s in result.stories if s.ok]},
+                         indent=2, default=str))
+    else:
+        print(f"{result.epic_key}\tepic")
+    for story in result.stories:
+        if not story.ok or args.create:
+            print(f"{story.key or 'ERROR: ' + str(story.error)}\t{story.title}",
+                  file=sys.stderr if not story.ok else sys.stdout)
+    print(" ".join(f"{stage}={secs:.2f}s" for stage, secs in result.timings.items()), file=sys.stderr)
+    return 0 if all(s.ok for s in result.stories) else 1
+
+
+def _warm_cache(args: argparse.Namespace) -> int:
+    """Field metadata (one /field pass for all projects), project info, accountId
+    and the epics in the local store; with ``--every`` keep doing it."""
+    from epic_creator.jiraClient import get_default_client
+    from epic_creator.services.epic_store import EpicSyncService, get_default_epic_store
+    from epic_creator.services.prefetch import MetadataPrefetcher
+
+    jira = get_default_client()
+    prefetcher = MetadataPrefetcher(jira, args.projects, concurrency=args.concurrency)
+    # synchronous: the store outlives this process, the in-memory epic index does not
+    sync = EpicSyncService(jira, get_default_epic_store())
+    while True:
+        start = time.perf_counter()
+        jira.account_id(refresh=args.refresh)
+        errors = prefetcher.warm(refresh=args.refresh or bool(args.every))
+        for project_key, error in errors.items():
+            synced = 0
+            if error is None:
+                try:
+                    synced = sync.sync(project_key)
+                except Exception as exc:
+                    error = errors[project_key] = str(exc)
+            status = f"ERROR: {error}" if error else f"ok\t{synced} epics synced"
+            print(f"{project_key}\t{status}", file=sys.stderr if error else sys.stdout)
+        print(f"warmed {len(errors)} projects in {time.perf_counter() - start:.2f}s")
+        if not args.every:
+            return 1 if any(errors.values()) else 0
+        time.sleep(args.every)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="epic-creator", description="AI-driven Jira epic creation")
+    ap.add_argument("--env-file", help="dotenv file with JIRA_* / OPENAI_API_KEY (default: .env)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("draft", help="generate and print the mapped fields, create nothing")
+    p.add_argument("project")
+    p.add_argument("prompt")
+    p.set_defaults(func=_draft)
+
+    p = sub.add_parser("create", help="generate the epic and create it in Jira")
+    p.add_argument("project")
+    p.add_argument("prompt")
+    p.set_defaults(func=_create)
+
+    p = sub.add_parser("breakdown", help="generate an epic plus child stories (and create them)")
+    p.add_argument("project")
+    p.add_argument("prompt")
+    p.add_argument("--create", action="store_true", help="create the epic and its stories in Jira")
+    p.add_argument("--max-stories", type=int, default=8)
+    p.add_argument("--concurrency", type=int, default=8, help="story drafts in flight")
+    p.set_defaults(func=_breakdown)
+
+    p = sub.add_parser("warm-cache", help="prefetch metadata and sync epics for projects (for cron)")
+    p.add_argument("projects", nargs="+")
+    p.add_argument("--refresh", action="store_true", help="refetch even if cached entries are fresh")
+    p.add_argument("--concurrency", type=int, default=8, help="createmeta requests in flight")
+    p.add_argument("--every", type=float, metavar="SECONDS", help="keep running, re-warming on this schedule")
+    p.set_defaults(func=_warm_cache)
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from epic_creator.config import load_config, missing_settings
+    from epic_creator.tracing import configure_from_env
+
+    load_config(args.env_file)
+    missing = missing_settings()
+    if missing:
+        print(f"missing settings: {', '.join(missing)} (set them or pass --env-file)", file=sys.stderr)
+        return 2
+    configure_from_env()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
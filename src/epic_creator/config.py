@@ -0,0 +1,45 @@
+###############################################################################
+# Explicit configuration loading                                              #
+###############################################################################
+"""
+Nothing in ``epic_creator`` reads ``.env`` on import. Entry points (the CLI,
+``__main__`` blocks, the Streamlit app) call ``load_config()`` once before
+building a ``JiraClient``; library callers may set the environment themselves.
+
+``EPIC_CREATOR_*`` tuning variables are likewise read when first used
+(``default_ttl()``, ``default_call_timeout()``, …), never at import, so
+``load_config()`` may run after the package is imported.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+PROJECT_ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+REQUIRED = ("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_API_TOKEN")
+
+_loaded: Path | None = None
+
+
+def load_config(env_file: str | Path | None = None, override: bool = False) -> Path | None:
+    """
+    Load ``env_file`` (default: ``$EPIC_CREATOR_ENV_FILE``, the repo's ``.env``,
+    else the nearest ``.env`` above the working directory). Existing variables
+    win unless ``override``. Returns the file used, or ``None`` if none was found.
+    """
+    global _loaded
+    if _loaded is not None and env_file is None and not override:
+        return _loaded
+
+    from dotenv import find_dotenv, load_dotenv
+
+    candidates = [env_file, os.environ.get("EPIC_CREATOR_ENV_FILE"), PROJECT_ENV_FILE, find_dotenv(usecwd=True)]
+    path = next((Path(c) for c in candidates if c and Path(c).is_file()), None)
+    if path is not None:
+        load_dotenv(dotenv_path=path, override=override)
+        _loaded = path
+    return path
+
+
+def missing_settings() -> list[str]:
+    return [name for name in REQUIRED if not os.environ.get(name)]
@@ -0,0 +1,175 @@
+###############################################################################
+# Epic + child stories breakdown                                              #
+###############################################################################
+"""
+    result = decompose_epic("PROJ", "Let users export invoices as PDF", create=True)
+    result.epic_key, [s.key for s in result.stories], result.timings
+
+Two LLM round-trips regardless of the number of stories: the epic prompt also
+asks for a list of story titles, then every story is drafted in one batched
+chain call (``max_concurrency`` at a time); stories that fail validation are
+repaired together, one batched call per repair round. When creating, the epic is POSTed
+while the stories are still being drafted, and the stories follow through
+``/issue/bulk`` with ``parent`` set to the new epic key.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List
+
+from epic_creator.jiraClient import JiraClient, get_default_client
+from epic_creator.services.field_meta    import FieldMetadataService
+from epic_creator.services.metadata_cache import get_default_cache
+from epic_creator.services.context       import FeatureContextService
+from epic_creator.services.epic_store    import get_default_epic_store
+from epic_creator.services.gather        import gather_context, run_concurrently
+from epic_creator.services.llm           import LLMService, get_default_llm_service
+from epic_creator.services.epic_handler  import BULK_LIMIT, EpicCreationHandler
+from epic_creator.services.repair        import map_many_with_repair, map_with_repair
+from epic_creator.tracing               import span
+
+log = logging.getLogger(__name__)
+
+STORY_TYPE = "Story"
+_STORIES_KEY = "stories"
+
+
+@dataclass
+class StoryResult:
+    title: str
+    fields: Dict[str, Any] | None = None      # mapped payload, without ``parent``
+    key: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class Breakdown:
+    project_key: str
+    epic: Dict[str, Any]                      # mapped epic payload
+    stories: List[StoryResult]
+    epic_key: str | None = None
+    timings: Dict[str, float] = field(default_factory=dict)   # stage → seconds
+
+
+@contextlib.contextmanager
+def _stage(timings: Dict[str, float], name: str, **attrs: Any) -> Iterator[Any]:
+    start = time.perf_counter()
+    try:
+        with span("stage", stage=name, **attrs) as sp:
+            yield sp
+    finally:
+        timings[name] = round(time.perf_counter() - start, 4)
+
+
+def _story_requirement(title: str, epic: Dict[str, Any]) -> str:
+    description = str(epic.get("description") or "")
+    if len(description) > 300:
+        description = description[:300].rsplit(" ", 1)[0] + " …"
+    return f"{title}\nPart of the epic \"{epic.get('summary', '')}\": {description}"
+
+
+def decompose_epic(
+    project_key: str,
+    manager_prompt: str,
+    jira: JiraClient | None = None,
+    llm_service: LLMService | None = None,
+    max_stories: int = 8,
+    concurrency: int = 8,
+    create: bool = False,
+) -> Breakdown:
+    """
+    Draft an epic and up to ``max_stories`` child stories; with ``create`` push
+    them to Jira. Stories that fail to draft or map carry an ``error`` and are
+    skipped – the epic and the other stories still go through.
+    """
+    jira = jira or get_default_client()
+    llm_service = llm_service or get_default_llm_service()
+    field_service   = FieldMetadataService(jira, cache=get_default_cache())
+    context_service = FeatureContextService(jira, store=get_default_epic_store(), cache=get_default_cache())
+    handler = EpicCreationHandler(jira, field_service)
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    # 1. Epic context and Story metadata together
+    with _stage(timings, "gather", project=project_key):
+        got = run_concurrently({
+            "epic": lambda: gather_context(field_service, context_service, project_key,
+                                           manager_prompt=manager_prompt),
+            "story_fields": lambda: field_service.get_issue_fields(project_key, STORY_TYPE),
+        })
+    ctx, story_fields = got["epic"], got["story_fields"]
+
+    # 2. Epic draft + story titles in one call
+    with _stage(timings, "llm.epic") as sp:
+        prompt = llm_service.build_budgeted_prompt(ctx.fields, ctx.project_info, ctx.recent_epics, manager_prompt,
+                                                   related=ctx.related, project_key=project_key)
+        text = (f"{prompt.text}\n\nAlso return \"{_STORIES_KEY}\": a list of up to {max_stories} "
+                f"short user-story titles that together deliver this epic")
+        epic_json = dict(llm_service.generate_epic(text))
+        titles = [str(t).strip() for t in epic_json.pop(_STORIES_KEY, None) or [] if str(t).strip()]
+        titles = list(dict.fromkeys(titles))[:max_stories]
+        sp.set(stories=len(titles))
+    with _stage(timings, "map.epic"):
+        epic, _ = map_with_repair(handler, llm_service, epic_json, ctx.fields, ctx.account_id)
+    if not titles:
+        log.warning("no stories came back for %s: %r", project_key, manager_prompt)
+    stories = [StoryResult(t) for t in titles]
+
+    # 3. Stories in one batch; the epic POST overlaps with it
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="epic-create") as pool:
+        epic_future = pool.submit(contextvars.copy_context().run, _create_epic,
+                                  handler, project_key, epic, timings) if create else None
+        with _stage(timings, "llm.stories", size=len(stories)):
+            prompts = [
+                llm_service.build_budgeted_prompt(story_fields, ctx.project_info, [],
+                                                  _story_requirement(s.title, epic), issue_type="story",
+                                                  project_key=project_key).text
+                for s in stories
+            ]
+            drafts = llm_service.generate_many(prompts, max_concurrency=concurrency) if prompts else []
+        with _stage(timings, "map.stories"):
+            drafted = [(s, d) for s, d in zip(stories, drafts) if not isinstance(d, Exception)]
+            for story, draft in zip(stories, drafts):
+                if isinstance(draft, Exception):
+                    story.error = f"draft failed: {draft}"
+            # every story that needs a repair shares one batched call per round
+            mapped = map_many_with_repair(handler, llm_service, [d for _, d in drafted], story_fields,
+                                          ctx.account_id, issue_type="story", max_concurrency=concurrency)
+            for (story, _), res in zip(drafted, mapped):
+                if isinstance(res, Exception):   # invalid draft or a failed repair call – skip this story
+                    story.error = str(res)
+                else:
+                    story.fields, _ = res
+        epic_key = epic_future.result() if epic_future else None
+
+    # 4. Children in bulk, linked to the epic
+    if epic_key:
+        ready = [s for s in stories if s.fields is not None]
+        with _stage(timings, "bulk_create", size=len(ready)):
+            for i in range(0, len(ready), BULK_LIMIT):
+                chunk = ready[i:i + BULK_LIMIT]
+                payloads = [(project_key, {**s.fields, "parent": {"key": epic_key}}) for s in chunk]
+                try:
+                    outcome = handler.create_epics_bulk(payloads, issue_type=STORY_TYPE)
+                except Exception as exc:   # network failure – this chunk fails, the rest go on
+                    outcome = [{"error": str(exc)}] * len(chunk)
+                for story, res in zip(chunk, outcome):
+                    story.key, story.error = res.get("key"), res.get("error")
+
+    timings["total"] = round(time.perf_counter() - started, 4)
+    return Breakdown(project_key, epic, stories, epic_key, timings)
+
+
+def _create_epic(handler: EpicCreationHandler, project_key: str, epic: Dict[str, Any],
+                 timings: Dict[str, float]) -> str:
+    with _stage(timings, "create.epic"):
+        return handler.create_epic(project_key, epic)
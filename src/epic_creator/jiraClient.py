@@ -3,49 +3,235 @@
 ###############################################################################
 from __future__ import annotations
 
+import codecs
+import contextlib
 import os
 import json
-from typing import Any, Dict, List
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, List
 import requests
-from pydantic import BaseModel, Field
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, stop_after_attempt, wait_exponential, retry_if_exception
+
+from .ratelimit import parse_retry_after
+from .scheduler import Scheduler, get_default_scheduler
+from .tracing import path_template, span
+
+# Only these are worth retrying; any other 4xx will fail the same way again.
+TRANSIENT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
 
-from pathlib import Path
-print(Path(__file__).resolve().parents[2] / ".env")
-from dotenv import load_dotenv; load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
 class JiraError(RuntimeError):
-    pass
+    def __init__(self, message: str, status_code: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def transient(self) -> bool:
+        return self.status_code is None or self.status_code in TRANSIENT_STATUSES
+
+    @property
+    def refused(self) -> bool:
+        """Jira turned the request away before acting on it (rate limited / in
+        maintenance), so even a POST that creates something may be sent again."""
+        return self.status_code == 429 or (self.status_code == 503 and self.retry_after is not None)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    return isinstance(exc, JiraError) and exc.transient
+
+
+def _is_refused(exc: BaseException) -> bool:
+    return isinstance(exc, JiraError) and exc.refused
+
+
+_backoff = wait_exponential(multiplier=1, min=1, max=10)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Honour ``Retry-After`` when Jira sends one, else exponential backoff."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, JiraError) and exc.retry_after is not None:
+        return min(exc.retry_after, 60.0)
+    return _backoff(retry_state)
+
+
+def _error_from(method: str, url: str, response: requests.Response) -> JiraError:
+    return JiraError(
+        f"{method} {url} → {response.status_code}: {response.text}",
+        status_code=response.status_code,
+        retry_after=parse_retry_after(response.headers.get("Retry-After")),
+    )
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array from a stream of byte chunks.
+    Only the current chunk plus one partial element is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    source = iter(chunks)
+    buf, pos, eof, state = "", 0, False, "open"        # open → first → item ⇄ sep
+
+    def refill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = next(source, None)
+        if chunk is None:
+            eof = True
+            tail = utf8.decode(b"", final=True)
+            buf, pos = buf[pos:] + tail, 0
+            return bool(tail)
+        buf, pos = buf[pos:] + utf8.decode(chunk), 0
+        return True
+
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if pos == len(buf):
+            if eof or not refill():
+                raise ValueError("truncated JSON array")
+            continue
+        if state == "open":
+            if buf[pos] != "[":
+                raise ValueError("expected a JSON array")
+            pos, state = pos + 1, "first"
+        elif state == "sep":
+            if buf[pos] == "]":
+                return
+            if buf[pos] != ",":
+                raise ValueError(f"unexpected {buf[pos]!r} in JSON array")
+            pos, state = pos + 1, "item"
+        elif state == "first" and buf[pos] == "]":
+            return
+        else:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof or not refill():
+                    raise
+                continue
+            # a number cut by the chunk boundary decodes as its head ("1500." → 1500,
+            # "12e" → 12): while only number characters follow, wait for more
+            if not eof and _NUMBER_TAIL.match(buf, end).end() == len(buf):
+                refill()
+                continue
+            yield item
+            pos, state = end, "sep"
+
 
 class JiraClient:
     """Thin wrapper around the JIRA Cloud REST API v2."""
 
-    def __init__(self, base_url: str | None = None, email: str | None = None, api_token: str | None = None):
+    def __init__(self, base_url: str | None = None, email: str | None = None, api_token: str | None = None,
+                 timeout: float = 30.0, pool_size: int = 32, scheduler: Scheduler | None = None):
         self.base_url = base_url or os.environ["JIRA_BASE_URL"].rstrip("/")
+        self.timeout = timeout          # per HTTP call, seconds
         email = email or os.environ["JIRA_EMAIL"]
         api_token = api_token or os.environ["JIRA_API_TOKEN"]
+        self.email = email
+        self._account_id: str | None = None
+        # every request takes a "jira" slot; backoff between retries does not hold one
+        self.scheduler = scheduler or get_default_scheduler()
         self.session = requests.Session()
+        # one client is shared by every Streamlit session / worker thread
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
         self.session.auth = (email, api_token)
         self.session.headers.update({
             "Accept": "application/json",
             "Content-Type": "application/json",
         })
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10),
-           retry=retry_if_exception_type(JiraError))
     def get(self, path: str, **params: Any) -> Any:
-        url = f"{self.base_url}{path}"
-        response = self.session.get(url, params=params)
-        if not response.ok:
-            raise JiraError(f"GET {url} → {response.status_code}: {response.text}")
         # return json.dumps(json.loads(response.text), sort_keys=True, indent=4, separators=(",", ": "))
-        return response.json()
+        return self._request("GET", path, params=params)
+
+    def post(self, path: str, payload: dict[str, Any], idempotent: bool = False) -> Any:
+        """POSTs create issues: a 5xx / 408 may arrive after Jira committed one, so
+        unless ``idempotent`` only refused requests (429, 503 + Retry-After) are retried."""
+        return self._request("POST", path, idempotent=idempotent, data=json.dumps(payload))
+
+    def _request(self, method: str, path: str, idempotent: bool = True, **kwargs: Any) -> Any:
+        """One traced call; transient failures are retried inside the span."""
+        url = f"{self.base_url}{path}"
+        retry = retry_if_exception(_is_transient if idempotent else _is_refused)
+        with span("jira.request", method=method, path=path_template(path)) as sp:
+            for attempt in Retrying(stop=stop_after_attempt(3), wait=_wait_retry_after,
+                                    retry=retry, reraise=True):
+                with attempt:
+                    with self.scheduler.slot("jira"):
+                        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                    sp.set(status=response.status_code, retries=attempt.retry_state.attempt_number - 1,
+                           bytes=len(response.content))
+                    if not response.ok:
+                        raise _error_from(method, url, response)
+                    return response.json()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10),
-           retry=retry_if_exception_type(JiraError))
-    def post(self, path: str, payload: dict[str, Any]) -> Any:
+    def iter_array(self, path: str, chunk_size: int = 64 * 1024, **params: Any) -> Iterator[Any]:
+        """
+        GET an endpoint whose body is a JSON array and yield its elements as
+        they arrive. Closing the generator early closes the connection. Each
+        attempt takes its own "jira" slot; the successful one keeps it until
+        the body is consumed or the generator is closed, never through backoff.
+        """
         url = f"{self.base_url}{path}"
-        response = self.session.post(url, data=json.dumps(payload))
-        if not response.ok:
-            raise JiraError(f"POST {url} → {response.status_code}: {response.text}")
-        return response.json()
\ No newline at end of file
+        with span("jira.request", method="GET", path=path_template(path), streamed=True) as sp:
+            for attempt in Retrying(stop=stop_after_attempt(3), wait=_wait_retry_after,
+                                    retry=retry_if_exception(_is_transient), reraise=True):
+                with attempt, contextlib.ExitStack() as stack:
+                    stack.enter_context(self.scheduler.slot("jira"))
+                    response = self.session.get(url, params=params, timeout=self.timeout, stream=True)
+                    stack.callback(response.close)
+                    sp.set(status=response.status_code, retries=attempt.retry_state.attempt_number - 1)
+                    if not response.ok:
+                        raise _error_from("GET", url, response)
+                    held = stack.pop_all()            # connection + slot, released after the body
+            received = 0
+
+            def chunks() -> Iterator[bytes]:
+                nonlocal received
+                for chunk in response.iter_content(chunk_size):
+                    received += len(chunk)
+                    yield chunk
+
+            try:
+                yield from iter_json_array(chunks())
+            finally:
+                held.close()
+                sp.set(bytes=received)
+
+    def account_id(self, refresh: bool = False) -> str:
+        """accountId of the API-token owner; fetched once per client, ``refresh`` forces a new GET."""
+        if refresh or self._account_id is None:
+            self._account_id = self.get("/rest/api/3/myself")["accountId"]
+        return self._account_id
+
+    def iter_search(self, jql: str, fields: str, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield every issue matching ``jql``, one ``/rest/api/2/search`` page at a time."""
+        start = 0
+        while True:
+            page = self.get("/rest/api/2/search", jql=jql, startAt=start,
+                            maxResults=page_size, fields=fields)
+            issues = page.get("issues", [])
+            yield from issues
+            start += len(issues)
+            if not issues or start >= page.get("total", 0):
+                break
+
+
+_default_clients: Dict[tuple, JiraClient] = {}
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> JiraClient:
+    """Process-wide client (one connection pool) for the credentials in the environment."""
+    key = (os.environ["JIRA_BASE_URL"].rstrip("/"), os.environ["JIRA_EMAIL"])
+    with _default_lock:
+        if key not in _default_clients:
+            _default_clients[key] = JiraClient()
+        return _default_clients[key]
@@ -0,0 +1,329 @@
+###############################################################################
+# Background job service: drafts + idempotent epic creation                   #
+###############################################################################
+"""
+    jobs = get_default_job_service()
+    job_id = jobs.submit_create("PROJ", idempotency_key=form_token, fields=mapped)
+    jobs.wait(job_id, timeout=30).result      # {"key": "PROJ-123"}
+
+Jobs run on a bounded thread pool; their state lives in SQLite
+(``jobs.sqlite`` in the cache dir) so results can be polled by id.
+
+A create job carries a client idempotency key. Submitting the same key again
+returns the existing job while it is queued / running / done, and a job that
+finds an earlier *attempt* with an unknown outcome (timeout, crash) searches
+Jira for the epic before POSTing again.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+import requests
+
+from epic_creator.jiraClient import JiraClient, JiraError, get_default_client
+from epic_creator.orchestrator import create_epic_from_prompt, stream_draft
+from epic_creator.services.field_meta    import FieldMetadataService
+from epic_creator.services.metadata_cache import get_default_cache
+from epic_creator.services.epic_handler  import EpicCreationHandler
+from epic_creator.services.llm           import LLMService
+from epic_creator.store import default_cache_dir
+from epic_creator.tracing import span
+
+log = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id              TEXT PRIMARY KEY,
+    kind            TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    project         TEXT NOT NULL,
+    idempotency_key TEXT,
+    params          TEXT NOT NULL,
+    result          TEXT,
+    error           TEXT,
+    attempted_at    REAL,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_idempotency ON jobs(idempotency_key, created_at);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at);
+"""
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    project_key: str
+    params: Dict[str, Any]
+    idempotency_key: str | None = None
+    result: Any = None
+    error: str | None = None
+    attempted_at: float | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+
+class JobStore:
+    """Job rows in SQLite; one connection shared across threads."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = str(path or default_cache_dir() / "jobs.sqlite")
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def insert(self, job: Job) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, project, idempotency_key, params, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.kind, job.status, job.project_key, job.idempotency_key,
+                 json.dumps(job.params), job.created_at, job.updated_at),
+            )
+
+    def update(self, job_id: str, **changes: Any) -> None:
+        if "result" in changes:
+            changes["result"] = json.dumps(changes["result"])
+        changes["updated_at"] = time.time()
+        cols = ", ".join(f"{k} = ?" for k in changes)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*changes.values(), job_id))
+
+    def get(self, job_id: str) -> Job | None:
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def by_idempotency_key(self, key: str) -> List[Job]:
+        """Every job submitted with ``key``, newest first."""
+        return self._query(
+            "SELECT * FROM jobs WHERE idempotency_key = ? ORDER BY created_at DESC", (key,)
+        )
+
+    def with_status(self, *statuses: str) -> List[Job]:
+        marks = ", ".join("?" * len(statuses))
+        return self._query(f"SELECT * FROM jobs WHERE status IN ({marks}) ORDER BY created_at", statuses)
+
+    def count(self, *statuses: str) -> int:
+        marks = ", ".join("?" * len(statuses))
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM jobs WHERE status IN ({marks})", statuses).fetchone()[0]
+
+    def prune(self, older_than: float) -> int:
+        """Drop finished jobs last touched more than ``older_than`` seconds ago."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, time.time() - older_than),
+            )
+        return cur.rowcount
+
+    def _query(self, sql: str, args: tuple) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            Job(r["id"], r["kind"], r["status"], r["project"], json.loads(r["params"]),
+                r["idempotency_key"], json.loads(r["result"]) if r["result"] else None, r["error"],
+                r["attempted_at"], r["created_at"], r["updated_at"])
+            for r in rows
+        ]
+
+
+class JobService:
+    """
+    Runs ``draft`` and ``create`` jobs on ``workers`` threads. At most
+    ``max_pending`` jobs may wait; beyond that ``submit_*`` raises ``JobQueueFull``.
+    """
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        jira: JiraClient | None = None,
+        llm_service: LLMService | None = None,
+        workers: int = 4,
+        max_pending: int = 200,
+    ):
+        self.store = store or JobStore()
+        self._jira = jira
+        self.llm_service = llm_service
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._submit_lock = threading.Lock()
+        self._done: Dict[str, threading.Event] = {}
+        self._recover()
+
+    @property
+    def jira(self) -> JiraClient:
+        return self._jira or get_default_client()
+
+    # ---------------------------- submit -------------------------------- #
+    def submit_draft(self, project_key: str, prompt: str, regenerate: bool = False) -> str:
+        return self._submit("draft", project_key, {"prompt": prompt, "regenerate": regenerate})
+
+    def submit_create(
+        self,
+        project_key: str,
+        idempotency_key: str,
+        fields: Dict[str, Any] | None = None,
+        prompt: str | None = None,
+    ) -> str:
+        """
+        Create an epic from already-mapped ``fields`` (e.g. the edited form) or
+        end-to-end from ``prompt``. Re-submitting ``idempotency_key`` returns
+        the job that is queued, running or already succeeded for it.
+        """
+        if (fields is None) == (prompt is None):
+            raise ValueError("pass exactly one of fields= or prompt=")
+        params = {"fields": fields} if fields is not None else {"prompt": prompt}
+        return self._submit("create", project_key, params, idempotency_key)
+
+    def _submit(self, kind: str, project_key: str, params: Dict[str, Any], idempotency_key: str | None = None) -> str:
+        with self._submit_lock:
+            if idempotency_key:
+                for prior in self.store.by_idempotency_key(idempotency_key):
+                    if prior.status != FAILED:
+                        return prior.id
+            if self.store.count(QUEUED) >= self.max_pending:
+                raise JobQueueFull(f"{self.max_pending} jobs already waiting")
+            now = time.time()
+            job = Job(uuid.uuid4().hex, kind, QUEUED, project_key, params, idempotency_key,
+                      created_at=now, updated_at=now)
+            self.store.insert(job)
+            self._done[job.id] = threading.Event()
+        # the submitter's scheduler user (and trace parent) follow the job
+        self._pool.submit(contextvars.copy_context().run, self._run, job.id)
+        return job.id
+
+    # ---------------------------- poll ---------------------------------- #
+    def get(self, job_id: str) -> Job | None:
+        return self.store.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Job | None:
+        """Block until the job finishes (or ``timeout``); returns its latest state."""
+        event = self._done.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    # ---------------------------- run ----------------------------------- #
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        try:
+            self.store.update(job_id, status=RUNNING)
+            with span("job", kind=job.kind, project=job.project_key):
+                result = self._draft(job) if job.kind == "draft" else self._create(job)
+            self.store.update(job_id, status=SUCCEEDED, result=result)
+        except Exception as exc:
+            log.warning("job %s (%s) failed", job_id, job.kind, exc_info=True)
+            self.store.update(job_id, status=FAILED, error=str(exc))
+        finally:
+            event = self._done.pop(job_id, None)
+            if event is not None:
+                event.set()
+
+    def _draft(self, job: Job) -> Dict[str, Any]:
+        drafts, _, prompt = stream_draft(self.jira, job.project_key, job.params["prompt"],
+                                         regenerate=job.params.get("regenerate", False),
+                                         llm_service=self.llm_service)
+        draft: Dict[str, Any] = {}
+        for draft in drafts:
+            pass
+        return {"draft": draft, "prompt_tokens": prompt.tokens}
+
+    def _create(self, job: Job) -> Dict[str, Any]:
+        fields = job.params.get("fields")
+        if fields is None:
+            fields = create_epic_from_prompt(job.project_key, job.params["prompt"],
+                                             jira=self.jira, llm_service=self.llm_service)
+            self.store.update(job.id, params=json.dumps({**job.params, "fields": fields}))
+
+        # checked before /rest/api/2/issue: a finished twin, or an earlier attempt
+        # whose POST may have landed although we never saw the response
+        for prior in self.store.by_idempotency_key(job.idempotency_key):
+            if prior.id == job.id:
+                continue
+            if prior.status == SUCCEEDED and prior.result:
+                return prior.result
+            if prior.attempted_at is not None:
+                found = self._find_created(job.project_key, fields.get("summary"), prior.attempted_at)
+                if found:
+                    return {"key": found, "recovered": True}
+
+        attempted_at = time.time()
+        self.store.update(job.id, attempted_at=attempted_at)
+        handler = EpicCreationHandler(self.jira, FieldMetadataService(self.jira, cache=get_default_cache()))
+        try:
+            return {"key": handler.create_epic(job.project_key, fields)}
+        except (JiraError, requests.RequestException) as exc:
+            if isinstance(exc, JiraError) and not exc.transient:
+                raise                       # rejected outright: nothing was created
+            # a 5xx or a lost response can follow a committed create – look before failing
+            found = self._find_created(job.project_key, fields.get("summary"), attempted_at)
+            if found:
+                return {"key": found, "recovered": True}
+            raise
+
+    def _find_created(self, project_key: str, summary: str | None, since: float) -> str | None:
+        """Epic with exactly this summary created since ``since`` (epoch), if Jira has one."""
+        if not summary:
+            return None
+        minutes = int((time.time() - since) / 60) + 5
+        phrase = summary.replace("\\", "\\\\").replace('"', '\\"')
+        jql = (f'project = "{project_key}" AND issuetype = Epic AND created >= "-{minutes}m" '
+               f'AND summary ~ "\\"{phrase}\\"" ORDER BY created ASC')
+        # if this lookup fails the job fails too – better than a possible duplicate
+        found = self.jira.get("/rest/api/2/search", jql=jql, maxResults=20, fields="summary")
+        for issue in found.get("issues", []):
+            if (issue.get("fields") or {}).get("summary") == summary:
+                return issue["key"]
+        return None
+
+    def _recover(self) -> None:
+        """Jobs left behind by a previous process: re-queue waiting ones; running
+        ones are failed (a create keeps ``attempted_at`` so a retry checks Jira first)."""
+        for job in self.store.with_status(RUNNING):
+            self.store.update(job.id, status=FAILED, error="interrupted")
+        for job in self.store.with_status(QUEUED):
+            self._done[job.id] = threading.Event()
+            self._pool.submit(self._run, job.id)
+
+
+_default_service: JobService | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_job_service() -> JobService:
+    """Process-wide job service used by the Streamlit app."""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = JobService()
+        return _default_service
@@ -1,52 +1,100 @@
 ###############################################################################
 # 5. Orchestrator / Facade                                                    #
 ###############################################################################
-from epic_creator.jiraClient import JiraClient
+import logging
+from typing import Any, Dict, Iterator, Tuple
+
+from epic_creator.jiraClient import JiraClient, get_default_client
 from epic_creator.services.field_meta    import FieldMetadataService
+from epic_creator.services.metadata_cache import get_default_cache
 from epic_creator.services.context       import FeatureContextService
-from epic_creator.services.llm           import LLMService
+from epic_creator.services.epic_store    import get_default_epic_store
+from epic_creator.services.gather        import gather_context
+from epic_creator.services.llm           import LLMService, get_default_llm_service
+from epic_creator.services.prompt_budget import PromptBuild
 from epic_creator.services.epic_handler  import EpicCreationHandler
+from epic_creator.services.repair        import map_with_repair
+from epic_creator.tracing               import configure_from_env as configure_tracing, span
+
+log = logging.getLogger(__name__)
+
 
-def create_epic_from_prompt(project_key: str, manager_prompt: str) -> str:
-    """End‑to‑end utility: returns new epic key (e.g., PROJ‑123)."""
-    jira = JiraClient()
+def create_epic_from_prompt(
+    project_key: str,
+    manager_prompt: str,
+    jira: JiraClient | None = None,
+    llm_service: LLMService | None = None,
+    create: bool = False,
+) -> Any:
+    """End‑to‑end utility: returns new epic key (e.g., PROJ‑123) when ``create``,
+    otherwise the mapped fields that would be sent."""
+    jira = jira or get_default_client()
     
-    # 1. Metadata
-    field_service = FieldMetadataService(jira)
-    account_id = field_service.get_user_id()
-    # print(account_id)
-    fields = field_service.get_epic_fields(project_key)
+    # 1+2. Metadata + context, fetched concurrently
+    field_service   = FieldMetadataService(jira, cache=get_default_cache())
+    context_service = FeatureContextService(jira, store=get_default_epic_store(), cache=get_default_cache())
+    with span("stage", stage="gather", project=project_key):
+        ctx = gather_context(field_service, context_service, project_key, manager_prompt=manager_prompt)
+    account_id, fields = ctx.account_id, ctx.fields
+    project_info, recent_epics = ctx.project_info, ctx.recent_epics
     # llm_fields = {k: v for k, v in fields.items()
     #               if k not in {"Project", "Work type", "Reporter"}}
-    # print(fields)
-
-    # 2. Context
-    context_service = FeatureContextService(jira)
-    project_info = context_service.get_project_overview(project_key)
-    recent_epics = context_service.get_recent_epics(project_key)
     # print(project_info)
     # print(recent_epics)
 
     # 3. LLM
-    llm_service   = LLMService()
-    prompt_text   = llm_service.build_prompt(
-        fields, project_info, recent_epics, manager_prompt
-    )
-    # print(prompt_text)
-    epic_obj      = llm_service.generate_epic(prompt_text)
+    llm_service   = llm_service or get_default_llm_service()
+    with span("stage", stage="prompt") as sp:
+        prompt    = llm_service.build_budgeted_prompt(
+            fields, project_info, recent_epics, manager_prompt,
+            related=ctx.related, project_key=project_key,
+        )
+        sp.set(tokens=prompt.tokens, prefix_tokens=prompt.prefix_tokens, prefix_version=prompt.prefix_version)
+    prompt_text   = prompt.text
+    log.info("prompt: %d/%d tokens, trimmed: %s", prompt.tokens, prompt.budget, prompt.trimmed or "nothing")
+    with span("stage", stage="llm"):
+        epic_obj  = llm_service.generate_epic(prompt_text)
     # print(epic_obj)
 
     # 4. Map + create
     handler = EpicCreationHandler(jira, field_service)
-    mapped_fields = handler.map_fields(epic_obj, fields, account_id)
-    print(mapped_fields)
-    # epic_key = handler.create_epic(project_key, mapped_fields)
-    # return epic_key
-    return mapped_fields
+    with span("stage", stage="map"):
+        # missing / invalid fields are re-asked on their own, not the whole draft
+        mapped_fields, _ = map_with_repair(handler, llm_service, epic_obj, fields, account_id)
+    log.debug("mapped fields: %s", mapped_fields)
+    if not create:
+        return mapped_fields
+    with span("stage", stage="create"):
+        return handler.create_epic(project_key, mapped_fields)
+
+def stream_draft(
+    jira: JiraClient,
+    project_key: str,
+    manager_prompt: str,
+    regenerate: bool = False,
+    llm_service: LLMService | None = None,
+) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any], PromptBuild]:
+    """Draft path of the Streamlit app: context + streamed LLM output, nothing pushed to Jira.
+    Returns (stream of partial drafts, field metadata, prompt build)."""
+    field_service   = FieldMetadataService(jira, cache=get_default_cache())
+    context_service = FeatureContextService(jira, store=get_default_epic_store(), cache=get_default_cache())
+    with span("stage", stage="gather", project=project_key):
+        ctx = gather_context(field_service, context_service, project_key,
+                             include_user=False, manager_prompt=manager_prompt)
+
+    llm_service = llm_service or get_default_llm_service()
+    with span("stage", stage="prompt") as sp:
+        prompt = llm_service.build_budgeted_prompt(ctx.fields, ctx.project_info, ctx.recent_epics, manager_prompt,
+                                                   related=ctx.related, project_key=project_key)
+        sp.set(tokens=prompt.tokens, prefix_tokens=prompt.prefix_tokens, prefix_version=prompt.prefix_version)
+    return llm_service.stream_epic(prompt.text, regenerate=regenerate), ctx.fields, prompt
 
 if __name__ == "__main__":
     # Example usage
+    from epic_creator.config import load_config
+    load_config()
+    configure_tracing()             # EPIC_CREATOR_TRACE=json prints one span per line
     project_key = "JIRADEMO"
     manager_prompt = "Build a UI-based tool for users to upload an image and text, and instantly generate temporally consistent video results."
-    create_epic_from_prompt(project_key, manager_prompt)
+    print(create_epic_from_prompt(project_key, manager_prompt))
     # print(f"Created epic: {epic_key}")
\ No newline at end of file
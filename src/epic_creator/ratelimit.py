@@ -0,0 +1,119 @@
+###############################################################################
+# Client-side rate limiting helpers                                           #
+###############################################################################
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping
+
+
+def default_jira_rps() -> float:
+    return float(os.environ.get("EPIC_CREATOR_JIRA_RPS", 10))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from threads and from any event loop.
+
+    ``reserve`` takes a token immediately (the balance may go negative) and
+    returns how long the caller must wait before using it, so callers queue
+    up fairly without holding a lock while they sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate                        # tokens per second
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= tokens
+            debt = max(0.0, -self._tokens) / self.rate
+            return (self._updated - now) + debt
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` (e.g. after a 429 or exhausted quota)."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._updated:
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = resume_at
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def shared_bucket(name: str, rate: float | None = None, capacity: float | None = None) -> TokenBucket:
+    """One bucket per ``name`` (usually a Jira base URL) for the whole process."""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            bucket = _buckets[name] = TokenBucket(rate if rate is not None else default_jira_rps(), capacity)
+        return bucket
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """``Retry-After`` as seconds; accepts delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _parse_reset(value: str) -> float | None:
+    try:
+        stamp = float(value)                       # epoch seconds
+        return max(0.0, stamp - time.time())
+    except ValueError:
+        pass
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))   # Jira Cloud: ISO 8601
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def observe_rate_limit_headers(bucket: TokenBucket, headers: Mapping[str, str]) -> float:
+    """
+    Feed Jira's ``X-RateLimit-*`` headers back into ``bucket``.
+    Returns the pause applied in seconds (0 when the quota is healthy).
+    """
+    pause = 0.0
+    if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+        pause = _parse_reset(headers["X-RateLimit-Reset"]) or 0.0
+    elif headers.get("X-RateLimit-NearLimit", "").lower() == "true":
+        pause = 1.0 / bucket.rate
+    if pause > 0:
+        bucket.pause(pause)
+    return pause
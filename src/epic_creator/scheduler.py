@@ -0,0 +1,225 @@
+###############################################################################
+# Process-wide call scheduler: per-resource limits, per-user fairness         #
+###############################################################################
+"""
+Every Jira request and every LLM call takes a slot from the shared scheduler:
+
+    with get_default_scheduler().slot("jira"):
+        session.request(...)
+
+Each resource has its own concurrency limit. Callers that find it full wait
+in a per-user FIFO queue, and the queues are served round-robin, so one user's
+batch of 60 drafts cannot starve another user's single draft. A call that
+cannot be queued (queue full) or waits past its deadline fails at once with
+``Overloaded`` instead of piling up.
+
+The user is a context variable (``as_user`` / ``set_user``); thread pools in
+this package copy the context, so work fanned out for a user stays theirs.
+
+    EPIC_CREATOR_JIRA_CONCURRENCY=16     # 0 = no limit
+    EPIC_CREATOR_LLM_CONCURRENCY=8
+    EPIC_CREATOR_QUEUE_LIMIT=200         # waiting calls per resource (per user: half)
+    EPIC_CREATOR_QUEUE_DEADLINE=30       # seconds a call may wait for a slot
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator
+
+from .tracing import register_gauge, span
+
+ANONYMOUS = "anonymous"
+
+_user: contextvars.ContextVar[str] = contextvars.ContextVar("epic_creator_user", default=ANONYMOUS)
+
+
+def current_user() -> str:
+    return _user.get()
+
+
+def set_user(user: str | None) -> contextvars.Token:
+    """Attribute the calls made from this context (and threads it spawns) to ``user``."""
+    return _user.set(user or ANONYMOUS)
+
+
+@contextlib.contextmanager
+def as_user(user: str | None) -> Iterator[None]:
+    token = set_user(user)
+    try:
+        yield
+    finally:
+        _user.reset(token)
+
+
+class Overloaded(RuntimeError):
+    """A call was shed: its queue is full or it waited past its deadline."""
+
+    def __init__(self, resource: str, reason: str):
+        super().__init__(f"{resource} is overloaded: {reason} – try again shortly")
+        self.resource = resource
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.granted = False
+
+
+class FairLimiter:
+    """At most ``limit`` holders; waiters are queued per user and admitted round-robin."""
+
+    def __init__(self, name: str, limit: int, max_queue: int = 200, max_queue_per_user: int | None = None,
+                 deadline: float = 30.0, window: int = 1000):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user or max(1, max_queue // 2)
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()   # round-robin order
+        self._queued = 0
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._counts = {"admitted": 0, "waited": 0, "rejected": 0, "expired": 0}
+
+    @contextlib.contextmanager
+    def slot(self, user: str | None = None, deadline: float | None = None) -> Iterator[None]:
+        self.acquire(user, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, user: str | None = None, deadline: float | None = None) -> float:
+        """Take a slot; returns the seconds spent waiting. Raises ``Overloaded``."""
+        user = user or current_user()
+        start = time.perf_counter()
+        with self._lock:
+            if self._active < self.limit and not self._queued:
+                self._active += 1
+                self._counts["admitted"] += 1
+                self._waits.append(0.0)
+                return 0.0
+            queue = self._queues.get(user)
+            if self._queued >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise Overloaded(self.name, f"{self._queued} calls already waiting")
+            if queue is not None and len(queue) >= self.max_queue_per_user:
+                self._counts["rejected"] += 1
+                raise Overloaded(self.name, f"{len(queue)} of your calls already waiting")
+            waiter = _Waiter()
+            if queue is None:
+                queue = self._queues[user] = deque()
+            queue.append(waiter)
+            self._queued += 1
+            self._counts["waited"] += 1
+
+        timeout = self.deadline if deadline is None else deadline
+        with span("sched.wait", resource=self.name, user=user) as sp:
+            waiter.event.wait(timeout)
+            with self._lock:
+                waited = time.perf_counter() - start
+                if not waiter.granted:                    # deadline passed while queued
+                    self._remove(user, waiter)
+                    self._counts["expired"] += 1
+                    sp.set(outcome="expired")
+                    raise Overloaded(self.name, f"no slot within {timeout:g}s")
+                self._waits.append(waited)
+            sp.set(outcome="admitted")
+        return waited
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            # hand the slot straight to the next user in line, then move them to the back
+            while self._queues and self._active < self.limit:
+                user, queue = next(iter(self._queues.items()))
+                waiter = queue.popleft()
+                self._queued -= 1
+                if queue:
+                    self._queues.move_to_end(user)
+                else:
+                    del self._queues[user]
+                waiter.granted = True
+                self._active += 1
+                self._counts["admitted"] += 1
+                waiter.event.set()
+
+    def _remove(self, user: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(user)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._queued -= 1
+            if not queue:
+                del self._queues[user]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            out: Dict[str, Any] = {
+                "limit": self.limit, "active": self._active, "queued": self._queued,
+                "queued_by_user": {u: len(q) for u, q in self._queues.items()},
+                **self._counts,
+            }
+        if waits:
+            out["wait_p50_ms"] = round(statistics.median(waits) * 1000, 1)
+            out["wait_p95_ms"] = round(waits[min(len(waits) - 1, int(0.95 * len(waits)))] * 1000, 1)
+        return out
+
+
+class Scheduler:
+    """One ``FairLimiter`` per resource; resources without a limit pass straight through."""
+
+    def __init__(self, limits: Dict[str, int], max_queue: int = 200, deadline: float = 30.0):
+        self.limiters: Dict[str, FairLimiter] = {
+            name: FairLimiter(name, limit, max_queue=max_queue, deadline=deadline)
+            for name, limit in limits.items() if limit > 0
+        }
+
+    @contextlib.contextmanager
+    def slot(self, resource: str, deadline: float | None = None) -> Iterator[None]:
+        limiter = self.limiters.get(resource)
+        if limiter is None:
+            yield
+            return
+        with limiter.slot(current_user(), deadline):
+            yield
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+    def gauges(self) -> Iterator[tuple]:
+        """``(metric, labels, value)`` for the Prometheus sink."""
+        for name, st in self.stats().items():
+            yield "scheduler_active", {"resource": name}, st["active"]
+            yield "scheduler_queue_depth", {"resource": name}, st["queued"]
+            for outcome in ("admitted", "rejected", "expired"):
+                yield f"scheduler_{outcome}_total", {"resource": name}, st[outcome]
+
+
+_default_scheduler: Scheduler | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_scheduler() -> Scheduler:
+    """Process-wide scheduler shared by every Streamlit session, job and CLI run."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = Scheduler(
+                {"jira": int(os.environ.get("EPIC_CREATOR_JIRA_CONCURRENCY", 16)),
+                 "llm": int(os.environ.get("EPIC_CREATOR_LLM_CONCURRENCY", 8))},
+                max_queue=int(os.environ.get("EPIC_CREATOR_QUEUE_LIMIT", 200)),
+                deadline=float(os.environ.get("EPIC_CREATOR_QUEUE_DEADLINE", 30)),
+            )
+            register_gauge(_default_scheduler.gauges)
+        return _default_scheduler
@@ -1,16 +1,45 @@
 ###############################################################################
 # 2. Feature Context Retrieval Service                                        #
 ###############################################################################
-from typing import Any, Dict, List
+import logging
+from typing import Any, Dict, Iterator, List
 from ..jiraClient import JiraClient
+from .epic_index import EpicIndexRegistry, default_registry
+from .epic_store import EpicStore, EpicSyncService, epic_jql
+from .metadata_cache import MetadataCache
+
+log = logging.getLogger(__name__)
 
 class FeatureContextService:
-    """Fetches organisational context (project summary, recent epics)."""
+    """Fetches organisational context (project summary, recent / relevant epics)."""
+
+    INDEX_WAIT = 0.5        # seconds a draft waits for a first index build before using recent epics
 
-    def __init__(self, jira_client: JiraClient):
+    def __init__(
+        self,
+        jira_client: JiraClient,
+        index_registry: EpicIndexRegistry = default_registry,
+        store: EpicStore | None = None,
+        cache: MetadataCache | None = None,
+    ):
         self.jira_client = jira_client
+        self.index_registry = index_registry
+        self.store = store          # when set, epics are synced locally and read from SQLite
+        self.cache = cache          # when set, project overviews are cached like field metadata
+
+    @staticmethod
+    def overview_key(project_key: str) -> str:
+        return f"{project_key}/overview"
+
+    def get_project_overview(self, project_key: str, refresh: bool = False) -> Dict[str, str]:
+        if self.cache is None:
+            return self._fetch_project_overview(project_key)
+        return self.cache.get_or_load(
+            self.jira_client.base_url, self.overview_key(project_key),
+            lambda: self._fetch_project_overview(project_key), force=refresh,
+        )
 
-    def get_project_overview(self, project_key: str) -> Dict[str, str]:
+    def _fetch_project_overview(self, project_key: str) -> Dict[str, str]:
         proj = self.jira_client.get(f"/rest/api/2/project/{project_key}")
         return {
             "name": proj.get("name"),
@@ -21,4 +50,36 @@ class FeatureContextService:
     def get_recent_epics(self, project_key: str, limit: int = 3) -> List[Dict[str, Any]]:
         jql = f"project = \"{project_key}\" AND issuetype = Epic ORDER BY created DESC"
         search = self.jira_client.get("/rest/api/2/search", jql=jql, maxResults=limit, fields="summary,description,labels")
-        return search.get("issues", [])
\ No newline at end of file
+        return search.get("issues", [])
+
+    def get_example_epics(self, project_key: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """The project's newest epics – the same for every prompt, so they can sit in
+        the cached prompt prefix. Read from the local store when it has them."""
+        if self.store is not None:
+            epics = self.store.recent(project_key, limit)
+            if epics:
+                return epics
+        return self.get_recent_epics(project_key, limit)
+
+    def get_relevant_epics(self, project_key: str, manager_prompt: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """The ``limit`` epics most similar to the prompt, from a local per-project index.
+        While the index is still being built (or cannot be) the newest epics stand in."""
+        try:
+            index = self.index_registry.get(
+                self.jira_client.base_url, project_key,
+                lambda since: self._iter_epics(project_key, since),
+                wait=self.INDEX_WAIT,
+            )
+        except Exception:
+            log.warning("epic index unavailable for %s, using recent epics", project_key, exc_info=True)
+            index = None
+        if index is None:
+            return self.get_example_epics(project_key, limit)
+        return index.search(manager_prompt, limit)
+
+    def _iter_epics(self, project_key: str, since: str | None = None) -> Iterator[Dict[str, Any]]:
+        if self.store is not None:
+            EpicSyncService(self.jira_client, self.store).sync(project_key)
+            yield from self.store.updated_since(project_key, since)
+            return
+        yield from self.jira_client.iter_search(epic_jql(project_key, since), "summary,description,labels,updated")
@@ -1,9 +1,12 @@
 ###############################################################################
 # 4. Dynamic JIRA Epic Creation Handler                                       #
 ###############################################################################
-from typing import List, Dict, Any
-from ..jiraClient import JiraClient
+from typing import List, Dict, Any, Tuple
+from ..jiraClient import JiraClient, JiraError
 from .field_meta import FieldMetadataService
+from .field_schema import FieldSchema, FieldValidationError, canonical
+
+BULK_LIMIT = 50      # Jira Cloud cap for /rest/api/2/issue/bulk
 
 class EpicCreationHandler:
     def __init__(self, jira_client: JiraClient, field_service: FieldMetadataService):
@@ -13,9 +16,10 @@ class EpicCreationHandler:
     # ----------------------------------------------------------- #
     # canonical form = lower-case, no spaces (cheap + collision-free)
     # ----------------------------------------------------------- #
-    @staticmethod
-    def _canonical(name: str) -> str:
-        return name.lower().replace(" ", "")
+    _canonical = staticmethod(canonical)
+
+    # filled by the handler itself, never required from the LLM
+    _HANDLER_FIELDS = frozenset({"summary", "description", "project", "worktype", "reporter"})
 
     def map_fields(
         self,
@@ -24,56 +28,95 @@ class EpicCreationHandler:
         account_id
     ) -> Dict[str, Any]:
         """
-        Translate LLM keys → Jira field IDs, case-insensitively.
-        Raises ValueError if any required field is missing.
+        Translate LLM keys (or field ids) → Jira field IDs, case-insensitively,
+        then coerce every value against the field schema locally.
+        Raises ``FieldValidationError`` (a ValueError) listing every required
+        field missing from the AI output and every value Jira would reject, so
+        ``services/repair.py`` can re-ask for exactly those.
         """
-        # Build a quick look-up from canonical LLM key → original key/value
-        llm_lookup = {
-            self._canonical(k): (k, v) for k, v in epic_json.items()
-        }
+        schema = FieldSchema.of(field_requirements)
+        llm_lookup = {canonical(k): v for k, v in epic_json.items()}
 
         mapped: Dict[str, Any] = {}
+        for key, val in epic_json.items():
+            spec = schema.lookup(key)
+            if spec is not None:
+                mapped[spec.id] = val
 
-        for human_name, meta in field_requirements.items():
-            canon = self._canonical(human_name)
-
-            # If LLM supplied a value (regardless of case/spacing)
-            if canon in llm_lookup:
-                _, val = llm_lookup[canon]
-                mapped[meta["id"]] = val
-
-            # If required but missing → error
-            elif meta["required"] and canon not in {
-                "summary", "description", "project", "worktype", "reporter"
-            }:
-                raise ValueError(
-                    f"Required field '{human_name}' missing from AI output"
-                )
+        missing: Dict[str, str] = {}
+        for spec in schema.required:
+            if spec.id not in mapped and canonical(spec.name) not in self._HANDLER_FIELDS:
+                missing[spec.id] = f"Required field '{spec.name}' missing from AI output"
 
         # Always set core fields from whatever key-form the LLM used
         for base in ("summary", "description"):
-            canon = self._canonical(base)
-            if canon not in llm_lookup:
-                raise ValueError(f"'{base}' missing from AI output")
-            _, val = llm_lookup[canon]
-            mapped[base] = val
+            if base not in llm_lookup:
+                missing[base] = f"'{base}' missing from AI output"
+            else:
+                mapped[base] = llm_lookup[base]
 
-        # Optional helpers
-        if "labels" in epic_json or "Labels" in epic_json:
-            mapped["labels"] = epic_json.get("labels") or epic_json.get("Labels")
-        if "priority" in epic_json or "Priority" in epic_json:
-            pri = epic_json.get("priority") or epic_json.get("Priority")
-            mapped["priority"] = {"name": pri}
+        # Optional helpers for sites whose Epic screen lacks these fields
+        for base in ("labels", "priority"):
+            if base not in mapped and llm_lookup.get(base):
+                mapped[base] = llm_lookup[base]
+        if isinstance(mapped.get("priority"), str) and schema.by_id("priority") is None:
+            mapped["priority"] = {"name": mapped["priority"]}
         mapped["reporter"] = {"id": account_id}
-        return mapped
+        try:
+            validated = schema.validate(mapped)
+        except FieldValidationError as exc:
+            raise FieldValidationError({**missing, **exc.errors}) from None
+        if missing:
+            raise FieldValidationError(missing)
+        return validated
 
-    def create_epic(self, project_key: str, epic_payload: Dict[str, Any]) -> str:
-        data = {
+    @staticmethod
+    def _issue_update(project_key: str, epic_payload: Dict[str, Any], issue_type: str = "Epic") -> Dict[str, Any]:
+        return {
             "fields": {
                 **epic_payload,
                 "project": {"key": project_key},
-                "issuetype": {"name": "Epic"}
+                "issuetype": {"name": issue_type}
             }
         }
+
+    def create_epic(self, project_key: str, epic_payload: Dict[str, Any]) -> str:
+        data = self._issue_update(project_key, epic_payload)
         result = self.jira_client.post("/rest/api/2/issue", payload=data)
-        return result.get("key")
\ No newline at end of file
+        return result.get("key")
+
+    def create_epics_bulk(
+        self, epics: List[Tuple[str, Dict[str, Any]]], issue_type: str = "Epic"
+    ) -> List[Dict[str, Any]]:
+        """
+        POST up to ``BULK_LIMIT`` ``(project_key, mapped_fields)`` pairs in one
+        ``/rest/api/2/issue/bulk`` call. Returns one ``{"key"|"error"}`` dict per
+        input, in order – a bad row never sinks the rest of the chunk.
+        ``issue_type`` lets the same call create an epic's child stories.
+        """
+        if len(epics) > BULK_LIMIT:
+            raise ValueError(f"Jira accepts at most {BULK_LIMIT} issues per bulk request")
+        if not epics:
+            return []
+        data = {"issueUpdates": [self._issue_update(pk, payload, issue_type) for pk, payload in epics]}
+        try:
+            result = self.jira_client.post("/rest/api/2/issue/bulk", payload=data)
+        except JiraError as exc:           # Jira answers 400 when *every* element failed
+            note = " (outcome unknown – check Jira before re-running)" if exc.transient and not exc.refused else ""
+            return [{"error": f"{exc}{note}"} for _ in epics]
+
+        failed = {
+            err.get("failedElementNumber"): err.get("elementErrors", {})
+            for err in result.get("errors", [])
+        }
+        created = iter(result.get("issues", []))
+        outcome: List[Dict[str, Any]] = []
+        for i in range(len(epics)):
+            if i in failed:
+                details = failed[i]
+                msgs = list(details.get("errors", {}).items()) + [("", m) for m in details.get("errorMessages", [])]
+                outcome.append({"error": "; ".join(f"{k}: {v}" if k else v for k, v in msgs) or "rejected by Jira"})
+            else:
+                issue = next(created, None)
+                outcome.append({"key": issue["key"]} if issue else {"error": "missing from bulk response"})
+        return outcome
\ No newline at end of file
@@ -0,0 +1,219 @@
+###############################################################################
+# Local Epic Relevance Index (hashed TF-IDF + NumPy top-k)                    #
+###############################################################################
+from __future__ import annotations
+
+import contextvars
+import logging
+import re
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z][a-z0-9]+")           # bare numbers only add hash collisions
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to "
+    "was were will with we our us you your can should into".split()
+)
+DESCRIPTION_CHARS = 400          # examples are context, not content – keep them short
+
+
+def _tokens(text: str) -> List[str]:
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]      # + bigrams
+
+
+def compact_epic(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip a search hit down to what the prompt needs, same ``{key, fields}`` shape."""
+    fields = issue.get("fields") or {}
+    description = fields.get("description") or ""
+    if not isinstance(description, str):            # v3 ADF → not worth rendering here
+        description = ""
+    if len(description) > DESCRIPTION_CHARS:
+        description = description[:DESCRIPTION_CHARS].rsplit(" ", 1)[0] + " …"
+    return {
+        "key": issue.get("key"),
+        "fields": {
+            "summary": fields.get("summary") or "",
+            "description": description,
+            "labels": fields.get("labels") or [],
+        },
+    }
+
+
+class EpicIndex:
+    """
+    Hashed TF-IDF vectors for one project's epics (summary, description,
+    labels), stored sparse: each epic keeps only its hashed token ids and tf,
+    8 bytes per distinct token or bigram (~1 KB for a full description), and
+    search adds 12 bytes per entry; the only dense array is the ``4 * dim``
+    document-frequency table. ``upsert`` is incremental; ``search`` is one
+    pass over the non-zero entries.
+    """
+
+    def __init__(self, dim: int = 8192):
+        self.dim = dim
+        self._rows: Dict[str, int] = {}               # issue key → row
+        self._docs: List[Dict[str, Any]] = []         # compact epics, by row
+        self._ids: List[np.ndarray] = []              # hashed token ids, by row
+        self._tf: List[np.ndarray] = []               # their sublinear tf, by row
+        self._df = np.zeros(dim, dtype=np.float32)
+        self._matrix: Tuple[np.ndarray, ...] | None = None   # (idf, rows, cols, weights); rebuilt lazily
+        self._lock = threading.Lock()
+        self.watermark: str | None = None             # max ``fields.updated`` seen
+        self.refreshed_at = 0.0
+        self.ready = threading.Event()                # set once the first build finished
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _vectorise(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        hashed = [zlib.crc32(tok.encode()) % self.dim for tok in _tokens(text)]
+        ids, counts = np.unique(np.asarray(hashed, dtype=np.int32), return_counts=True)
+        return ids.astype(np.int32), np.log1p(counts.astype(np.float32))     # sublinear tf
+
+    def upsert(self, issues: Iterable[Dict[str, Any]]) -> int:
+        issues = list(issues)                         # drain the (network) iterator outside the lock
+        added = 0
+        with self._lock:
+            for issue in issues:
+                doc = compact_epic(issue)
+                f = doc["fields"]
+                ids, tf = self._vectorise(" ".join([f["summary"]] * 2 + [f["description"]] + f["labels"]))
+                updated = (issue.get("fields") or {}).get("updated")
+                if updated and (self.watermark is None or updated > self.watermark):
+                    self.watermark = updated
+
+                row = self._rows.get(doc["key"])
+                if row is None:
+                    self._rows[doc["key"]] = len(self._docs)
+                    self._docs.append(doc)
+                    self._ids.append(ids)
+                    self._tf.append(tf)
+                else:
+                    self._df[self._ids[row]] -= 1.0
+                    self._ids[row], self._tf[row], self._docs[row] = ids, tf, doc
+                self._df[ids] += 1.0                  # ids are unique per epic
+                added += 1
+            if added:
+                self._matrix = None
+            self.refreshed_at = time.time()
+        return added
+
+    def _compile(self) -> Tuple[np.ndarray, ...]:
+        """Flatten the rows into COO arrays with tf·idf weights, L2-normalised per epic."""
+        n = len(self._docs)
+        idf = (np.log((1 + n) / (1 + self._df)) + 1.0).astype(np.float32)
+        rows = np.repeat(np.arange(n, dtype=np.int32), [len(ids) for ids in self._ids])
+        cols = np.concatenate(self._ids)
+        weights = np.concatenate(self._tf) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+        weights = (weights / np.maximum(norms, 1e-9)[rows]).astype(np.float32)
+        return idf, rows, cols, weights
+
+    def search(self, text: str, k: int = 3) -> List[Dict[str, Any]]:
+        with self._lock:
+            if not self._docs:
+                return []
+            if self._matrix is None:
+                self._matrix = self._compile()
+            idf, rows, cols, weights = self._matrix
+            ids, tf = self._vectorise(text)
+            query = np.zeros(self.dim, dtype=np.float32)
+            query[ids] = tf * idf[ids]
+            query /= max(float(np.linalg.norm(query)), 1e-9)
+            scores = np.bincount(rows, weights=weights * query[cols], minlength=len(self._docs))
+            k = min(k, len(scores))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [self._docs[i] for i in top]
+
+
+class EpicIndexRegistry:
+    """
+    One index per ``(base_url, project_key)``. The first lookup starts a build
+    in the background – paging a project's whole epic history can take far
+    longer than a draft may wait – and ``get`` returns ``None`` until it is
+    ready. Afterwards stale indexes refresh in the background with only the
+    epics updated since the last watermark.
+    """
+
+    def __init__(self, refresh_after: float = 600.0):
+        self.refresh_after = refresh_after
+        self._indexes: Dict[Tuple[str, str], EpicIndex] = {}
+        self._refreshing: set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        base_url: str,
+        project_key: str,
+        loader: Callable[[str | None], Iterable[Dict[str, Any]]],
+        wait: float = 0.0,
+    ) -> EpicIndex | None:
+        """``loader(since)`` yields epics updated at/after ``since`` (``None`` → all).
+        Waits up to ``wait`` seconds for a build in progress, then gives up with ``None``."""
+        key = (base_url, project_key)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = EpicIndex()
+                build = True
+            else:
+                build = False
+
+        if build:
+            self._background(key, "build", lambda: self._build(key, index, loader))
+        if not index.ready.wait(wait):
+            return None
+        if time.time() - index.refreshed_at > self.refresh_after:
+            self._refresh(key, index, loader)
+        return index
+
+    def _build(self, key, index: EpicIndex, loader) -> None:
+        try:
+            index.upsert(loader(None))
+        except Exception:
+            log.warning("epic index build for %s failed", key, exc_info=True)
+            with self._lock:
+                if self._indexes.get(key) is index:
+                    self._indexes.pop(key)        # the next lookup tries again
+            return
+        index.ready.set()
+
+    @staticmethod
+    def _background(key, kind: str, run: Callable[[], None]) -> None:
+        # the caller's context goes along: scheduler user and trace parent
+        threading.Thread(target=contextvars.copy_context().run, args=(run,),
+                         name=f"epic-index-{kind}:{key[1]}", daemon=True).start()
+
+    def invalidate(self, base_url: str, project_key: str) -> None:
+        with self._lock:
+            self._indexes.pop((base_url, project_key), None)
+
+    def _refresh(self, key, index: EpicIndex, loader) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                index.upsert(loader(index.watermark))
+            except Exception:
+                log.warning("epic index refresh for %s failed", key, exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._background(key, "refresh", run)
+
+
+default_registry = EpicIndexRegistry()
@@ -0,0 +1,174 @@
+###############################################################################
+# Local Epic Store + incremental sync                                         #
+###############################################################################
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from ..jiraClient import JiraClient
+from ..store import default_cache_dir
+
+SYNC_FIELDS = "summary,description,labels,status,priority,created,updated"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key         TEXT PRIMARY KEY,
+    project     TEXT NOT NULL,
+    summary     TEXT,
+    description TEXT,
+    labels      TEXT NOT NULL DEFAULT '[]',
+    created     TEXT,
+    updated     TEXT,
+    raw         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_project_created ON issues(project, created);
+CREATE INDEX IF NOT EXISTS issues_project_updated ON issues(project, updated);
+CREATE TABLE IF NOT EXISTS issue_labels (
+    key   TEXT NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (label, key)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project   TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL
+);
+"""
+
+
+def epic_jql(project_key: str, updated_since: str | None = None) -> str:
+    """Epics of a project, oldest update first, optionally only those touched since a Jira timestamp."""
+    jql = f"project = \"{project_key}\" AND issuetype = Epic"
+    if updated_since:
+        # JQL only takes minutes in the user's time zone – overlap by a day, upserts are idempotent
+        day = datetime.fromisoformat(updated_since[:10]) - timedelta(days=1)
+        jql += f" AND updated >= \"{day:%Y-%m-%d}\""
+    return jql + " ORDER BY updated ASC"
+
+
+class EpicStore:
+    """SQLite copy of a project's epics, queried locally instead of via JQL."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = str(path or default_cache_dir() / "epics.sqlite")
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # ---------------------------- writes -------------------------------- #
+    def upsert(self, project_key: str, issues: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+        for issue in issues:
+            f = issue.get("fields") or {}
+            description = f.get("description")
+            rows.append((
+                issue["key"], project_key, f.get("summary"),
+                description if isinstance(description, str) else None,
+                json.dumps(f.get("labels") or []), f.get("created"), f.get("updated"),
+                json.dumps(issue),
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO issues "
+                "(key, project, summary, description, labels, created, updated, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+            )
+            keys = [(r[0],) for r in rows]
+            self._conn.executemany("DELETE FROM issue_labels WHERE key = ?", keys)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO issue_labels (key, label) VALUES (?, ?)",
+                [(r[0], label) for r in rows for label in json.loads(r[4])],
+            )
+        return len(rows)
+
+    def get_watermark(self, project_key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM sync_state WHERE project = ?", (project_key,)
+            ).fetchone()
+        return row["watermark"] if row else None
+
+    def set_watermark(self, project_key: str, watermark: str | None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (project, watermark, synced_at) VALUES (?, ?, ?)",
+                (project_key, watermark, time.time()),
+            )
+
+    # ---------------------------- reads --------------------------------- #
+    def by_key(self, key: str) -> Dict[str, Any] | None:
+        rows = self._query("SELECT raw FROM issues WHERE key = ?", (key,))
+        return rows[0] if rows else None
+
+    def recent(self, project_key: str, limit: int = 3) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT raw FROM issues WHERE project = ? ORDER BY created DESC LIMIT ?",
+            (project_key, limit),
+        )
+
+    def by_label(self, project_key: str, label: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT i.raw FROM issue_labels l JOIN issues i ON i.key = l.key "
+            "WHERE l.label = ? AND i.project = ? ORDER BY i.created DESC LIMIT ?",
+            (label, project_key, limit),
+        )
+
+    def updated_since(self, project_key: str, since: str | None = None) -> Iterator[Dict[str, Any]]:
+        """All of a project's epics (``since=None``) or those updated after ``since``."""
+        sql, args = "SELECT raw FROM issues WHERE project = ?", [project_key]
+        if since:
+            sql, args = sql + " AND updated > ?", args + [since]
+        yield from self._query(sql + " ORDER BY updated", tuple(args))
+
+    def _query(self, sql: str, args: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [json.loads(r["raw"]) for r in self._conn.execute(sql, args)]
+
+
+class EpicSyncService:
+    """Pages a project's epics from Jira into an ``EpicStore``, incrementally."""
+
+    def __init__(self, jira_client: JiraClient, store: EpicStore):
+        self.jira_client = jira_client
+        self.store = store
+
+    def sync(self, project_key: str, full: bool = False, page_size: int = 100) -> int:
+        """Fetch epics updated since the stored watermark (everything if ``full``).
+        Each page is written as it arrives; returns the number of issues stored."""
+        watermark = None if full else self.store.get_watermark(project_key)
+        jql = epic_jql(project_key, watermark)
+
+        stored, page = 0, []
+        for issue in self.jira_client.iter_search(jql, SYNC_FIELDS, page_size):
+            page.append(issue)
+            updated = (issue.get("fields") or {}).get("updated")
+            if updated and (watermark is None or updated > watermark):
+                watermark = updated
+            if len(page) >= page_size:
+                stored += self.store.upsert(project_key, page)
+                page = []
+        stored += self.store.upsert(project_key, page)
+        self.store.set_watermark(project_key, watermark)
+        return stored
+
+
+_default_store: EpicStore | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_epic_store() -> EpicStore:
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = EpicStore()
+        return _default_store
@@ -1,11 +1,28 @@
 ###############################################################################
 # 1. Field Metadata Retrieval Service                                         #
 ###############################################################################
-from typing import Any, Dict, List
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List
 from ..jiraClient import JiraClient
+from .field_schema import FieldSchema
+from .metadata_cache import MetadataCache
+
 class FieldMetadataService:
-    def __init__(self, jira_client: JiraClient):
+    _catalogue_lock = threading.Lock()
+
+    def __init__(self, jira_client: JiraClient, cache: MetadataCache | None = None, catalogue: str = "filtered"):
         self.jira_client = jira_client
+        self.cache = cache
+        # {field id: /field entry, or None if the catalogue lacks it}; the catalogue
+        # is site-wide, so with a cache every project (and prefetch) shares it
+        self._catalogue: Dict[str, Dict[str, Any] | None] = (
+            cache.site_memo(jira_client.base_url) if cache is not None else {}
+        )
+        # "filtered": stream /field only for Epic fields createmeta left without name/schema
+        # "full":     load the whole /field catalogue alongside createmeta (old behaviour)
+        self.catalogue = catalogue
 
     def _index_by_id(self, fields: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         return {f["id"]: f for f in fields}
@@ -83,27 +100,130 @@ class FieldMetadataService:
 
         return epic_fields
 
-    def get_epic_fields(self, project_key: str) -> Dict[str, Any]:
-        # discover Epic issueTypeId
+    def get_epic_fields(self, project_key: str, refresh: bool = False) -> FieldSchema:
+        """Epic field metadata, served from ``self.cache`` when one is attached.
+        The result is a compiled ``FieldSchema`` (still a name → meta mapping)."""
+        return self._schema(project_key, lambda: self._fetch_epic_fields(project_key, refresh=refresh), refresh)
+
+    @staticmethod
+    def issue_type_key(project_key: str, issue_type: str) -> str:
+        """Cache key of a non-Epic issue type's metadata, next to the project's Epic entry."""
+        return f"{project_key}#{issue_type.lower()}"
+
+    def get_issue_fields(self, project_key: str, issue_type: str, refresh: bool = False) -> FieldSchema:
+        """Same as ``get_epic_fields`` for another issue type (e.g. the Stories of a breakdown)."""
+        if issue_type.lower() == "epic":
+            return self.get_epic_fields(project_key, refresh)
+        # cached next to the Epic entry; ``invalidate(site)`` drops both
+        return self._schema(self.issue_type_key(project_key, issue_type),
+                            lambda: self._fetch_epic_fields(project_key, issue_type, refresh), refresh)
+
+    def _schema(self, cache_key: str, load, refresh: bool) -> FieldSchema:
+        if self.cache is None:
+            return FieldSchema(load())
+        raw = self.cache.get_or_load(self.jira_client.base_url, cache_key, load, force=refresh)
+        # the cache hands back the same dict until it reloads, so compile once per load
+        return self.cache.derived(self.jira_client.base_url, cache_key, raw, FieldSchema)
+
+    def _fetch_epic_fields(self, project_key: str, issue_type: str = "epic", refresh: bool = False) -> Dict[str, Any]:
+        if self.catalogue == "full" and issue_type == "epic":
+            return self._fetch_epic_fields_full(project_key)
+        epic_meta = self._fetch_epic_createmeta(project_key, issue_type)
+        catalogue = self._catalogue_subset(self._missing_ids(epic_meta), refresh=refresh)
+        return self._process_field_metadata1(catalogue, [epic_meta])
+
+    def prefetch(self, project_keys: Iterable[str], concurrency: int = 8, refresh: bool = True) -> Dict[str, str | None]:
+        """
+        Warm ``self.cache`` for many projects at once: createmeta for every
+        project concurrently, then one pass over ``/field`` for the union of
+        ids they need. Returns ``{project: error message or None}``.
+        """
+        if self.cache is None:
+            raise ValueError("prefetch needs a MetadataCache")
+        project_keys = list(dict.fromkeys(project_keys))
+        metas: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str | None] = {pk: None for pk in project_keys}
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(project_keys))),
+                                thread_name_prefix="prefetch") as pool:
+            futures = {
+                pool.submit(contextvars.copy_context().run, self._fetch_epic_createmeta, pk): pk
+                for pk in project_keys
+            }
+            for fut in as_completed(futures):
+                pk = futures[fut]
+                try:
+                    metas[pk] = fut.result()
+                except Exception as exc:
+                    errors[pk] = str(exc)
+
+        missing = set().union(*(self._missing_ids(m) for m in metas.values()))
+        catalogue = self._catalogue_subset(missing, refresh=refresh)
+        for pk, meta in metas.items():
+            raw = self._process_field_metadata1(catalogue, [meta])
+            self.cache.get_or_load(self.jira_client.base_url, pk, lambda raw=raw: raw, force=True)
+        return errors
+
+    @staticmethod
+    def _missing_ids(epic_meta: Dict[str, Any]) -> set:
+        """Epic fields whose createmeta entry lacks a name or schema."""
+        raw_fields = epic_meta.get("fields") or []
+        items = raw_fields.items() if isinstance(raw_fields, dict) else ((f["fieldId"], f) for f in raw_fields)
+        return {fid for fid, meta in items if not (meta.get("name") and meta.get("schema"))}
+
+    def _fetch_epic_createmeta(self, project_key: str, issue_type: str = "epic") -> Dict[str, Any]:
+        # discover Epic issueTypeId, then its field metadata (fields included by default)
         types = self.jira_client.get(
             f"/rest/api/3/issue/createmeta/{project_key}/issuetypes"
         )["issueTypes"]
-        epic_id = next(t["id"] for t in types if t["name"].lower() == "epic")
-
-        # fetch field metadata for that ID (fields included by default)
-        epic_meta = self.jira_client.get(
+        wanted = issue_type.lower()
+        try:
+            epic_id = next(t["id"] for t in types if t["name"].lower() == wanted)
+        except StopIteration:
+            raise ValueError(f"project {project_key} has no '{issue_type}' issue type") from None
+        return self.jira_client.get(
             f"/rest/api/3/issue/createmeta/{project_key}/issuetypes/{epic_id}"
         )
-        
-        # global field catalogue for nice names / schemas
-        all_fields = self.jira_client.get("/rest/api/3/field")
+
+    def _catalogue_subset(self, field_ids: set, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Entries of ``/rest/api/3/field`` for ``field_ids`` only. Ids already seen
+        on this site come from the shared memo; the rest are parsed as the
+        catalogue streams in, and the download stops once every id has been seen."""
+        if not field_ids:
+            return []
+        site = self._catalogue
+        with self._catalogue_lock:
+            known = {} if refresh else {fid: site[fid] for fid in field_ids if fid in site}
+        wanted = set(field_ids) - known.keys()
+        found: Dict[str, Dict[str, Any] | None] = {}
+        if wanted:
+            stream = self.jira_client.iter_array("/rest/api/3/field")
+            try:
+                for field in stream:
+                    if field.get("id") in wanted:
+                        found[field["id"]] = field
+                        wanted.discard(field["id"])
+                        if not wanted:
+                            break
+            finally:
+                stream.close()
+            found.update(dict.fromkeys(wanted))          # not in the catalogue at all
+            with self._catalogue_lock:
+                site.update(found)
+        return [f for f in (*known.values(), *found.values()) if f is not None]
+
+    def _fetch_epic_fields_full(self, project_key: str) -> Dict[str, Any]:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="field-catalogue") as pool:
+            # global field catalogue for nice names / schemas – independent of
+            # the Epic id, so it runs alongside the two createmeta calls
+            all_fields_future = pool.submit(contextvars.copy_context().run,
+                                            self.jira_client.get, "/rest/api/3/field")
+            epic_meta = self._fetch_epic_createmeta(project_key)
+            all_fields = all_fields_future.result()
+        with self._catalogue_lock:
+            self._catalogue.update((f["id"], f) for f in all_fields)
 
         return self._process_field_metadata1(all_fields, [epic_meta])
     
-    def get_user_id(self):
-        # discover Epic issueTypeId
-        accountId = self.jira_client.get(
-            f"/rest/api/3/myself"
-        )["accountId"]
-
-        return accountId
+    def get_user_id(self, refresh: bool = False) -> str:
+        # the token owner never changes for a client, so JiraClient keeps it
+        return self.jira_client.account_id(refresh)
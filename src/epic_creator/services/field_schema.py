@@ -0,0 +1,222 @@
+###############################################################################
+# Compiled Epic field schema: lookups, validation and value coercion          #
+###############################################################################
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Jira accepts these as plain refs; they are filled in by the handler, not the LLM
+_PASSTHROUGH_TYPES = frozenset({"project", "issuetype", "attachment", "issuelinks"})
+
+# Jira schema type → what the LLM writes for it (options become enums per field)
+_JSON_TYPES = {
+    "string": {"type": "string"},
+    "number": {"type": "number"},
+    "date": {"type": "string", "format": "date"},
+    "datetime": {"type": "string", "format": "date-time"},
+    "priority": {"type": "string"},
+    "option": {"type": "string"},
+}
+
+
+def canonical(name: str) -> str:
+    """lower-case, no spaces – the key form ``map_fields`` has always matched on."""
+    return name.lower().replace(" ", "")
+
+
+class FieldValidationError(ValueError):
+    """Payload rejected locally; ``errors`` maps field id → reason."""
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__("; ".join(f"{fid}: {msg}" for fid, msg in errors.items()))
+        self.errors = errors
+
+
+class FieldSpec:
+    __slots__ = ("id", "name", "required", "type", "items", "allowed", "_options")
+
+    def __init__(self, name: str, meta: Dict[str, Any]):
+        schema = meta.get("schema") or {}
+        self.id: str = meta["id"]
+        self.name = name
+        self.required: bool = bool(meta.get("required"))
+        self.type: str | None = schema.get("type")
+        self.items: str | None = schema.get("items")
+        self.allowed: Tuple[Dict[str, Any], ...] = tuple(meta.get("allowed") or ())
+        # canonical label / id → the reference Jira expects back
+        self._options: Dict[str, Dict[str, Any]] = {}
+        for opt in self.allowed:
+            ref = {"id": str(opt["id"])} if "id" in opt else {k: opt[k] for k in ("value", "name") if k in opt}
+            for label in (opt.get("value"), opt.get("name"), opt.get("id")):
+                if label is not None:
+                    self._options.setdefault(canonical(str(label)), ref)
+
+    @property
+    def labels(self) -> List[str]:
+        return [str(o.get("value") or o.get("name") or o.get("id")) for o in self.allowed]
+
+    def json_schema(self) -> Dict[str, Any]:
+        """JSON-schema fragment for the value the LLM should return (display form, not Jira refs)."""
+        one = ({"enum": self.labels} if self._options
+               else _JSON_TYPES.get(self.items if self.type == "array" else self.type, {}))
+        return {"type": "array", "items": one} if self.type == "array" else dict(one)
+
+    # ------------------------------------------------------------------ #
+    def coerce(self, value: Any) -> Any:
+        """Return the value in the shape Jira wants, or raise ``ValueError``."""
+        if self.type == "array":
+            items = value.split(",") if isinstance(value, str) else value
+            if not isinstance(items, (list, tuple, set)):
+                items = [items]
+            return [self._coerce_one(self.items, v) for v in items if v not in ("", None)]
+        return self._coerce_one(self.type, value)
+
+    def _coerce_one(self, kind: str | None, value: Any) -> Any:
+        if self._options:
+            return self._option(value)
+        if kind == "string":
+            text = value if isinstance(value, str) else str(value)
+            if self.id == "labels":                      # Jira rejects labels containing spaces
+                return text.strip().replace(" ", "-")
+            return text
+        if kind == "number":
+            if isinstance(value, bool):
+                raise ValueError(f"expected a number, got {value!r}")
+            if isinstance(value, (int, float)):
+                return value
+            try:
+                return float(str(value).strip())
+            except ValueError:
+                raise ValueError(f"expected a number, got {value!r}") from None
+        if kind == "date":
+            return self._date(value).isoformat()
+        if kind == "datetime":
+            return self._datetime(value).strftime("%Y-%m-%dT%H:%M:%S.000%z")
+        if kind == "user":
+            if isinstance(value, dict):
+                account = value.get("id") or value.get("accountId")
+            else:
+                account = value
+            if not account or not isinstance(account, str):
+                raise ValueError(f"expected an accountId, got {value!r}")
+            return {"id": account}
+        if kind in ("priority", "option", "resolution", "version", "component"):
+            # no allowed values published: pass a name/id ref through
+            if isinstance(value, dict):
+                return value
+            return {"name": str(value)}
+        return value                                     # project, issuetype, unknown custom types
+
+    def _option(self, value: Any) -> Dict[str, Any]:
+        if isinstance(value, dict):
+            value = value.get("id") or value.get("value") or value.get("name")
+        ref = self._options.get(canonical(str(value))) if value is not None else None
+        if ref is None:
+            raise ValueError(f"{value!r} is not one of: {', '.join(self.labels)}")
+        return dict(ref)
+
+    @staticmethod
+    def _date(value: Any) -> dt.date:
+        if isinstance(value, dt.datetime):
+            return value.date()
+        if isinstance(value, dt.date):
+            return value
+        try:
+            return dt.date.fromisoformat(str(value).strip()[:10])
+        except ValueError:
+            raise ValueError(f"expected a YYYY-MM-DD date, got {value!r}") from None
+
+    @staticmethod
+    def _datetime(value: Any) -> dt.datetime:
+        if isinstance(value, dt.datetime):
+            parsed = value
+        elif isinstance(value, dt.date):
+            parsed = dt.datetime.combine(value, dt.time())
+        else:
+            try:
+                parsed = dt.datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+            except ValueError:
+                raise ValueError(f"expected an ISO datetime, got {value!r}") from None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt.timezone.utc)
+
+
+class FieldSchema(Mapping):
+    """
+    Epic field metadata compiled once per fetch. Still reads like the old
+    ``{display_name: {id, required, schema, allowed}}`` dict, and adds O(1)
+    lookups by id / canonical name plus local validation of payloads.
+    """
+
+    __slots__ = ("raw", "_specs", "_by_id", "_by_canonical", "required")
+
+    def __init__(self, raw: Dict[str, Dict[str, Any]]):
+        self.raw = raw
+        self._specs = {name: FieldSpec(name, meta) for name, meta in raw.items()}
+        self._by_id = {s.id: s for s in self._specs.values()}
+        self._by_canonical = {canonical(s.name): s for s in self._specs.values()}
+        self.required: Tuple[FieldSpec, ...] = tuple(s for s in self._specs.values() if s.required)
+
+    @classmethod
+    def of(cls, fields: "FieldSchema | Dict[str, Dict[str, Any]]") -> "FieldSchema":
+        return fields if isinstance(fields, FieldSchema) else cls(fields)
+
+    # Mapping protocol over the raw metadata
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self.raw[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    # ------------------------------------------------------------------ #
+    def by_id(self, field_id: str) -> FieldSpec | None:
+        return self._by_id.get(field_id)
+
+    def by_canonical(self, key: str) -> FieldSpec | None:
+        return self._by_canonical.get(key)
+
+    def lookup(self, key: str) -> FieldSpec | None:
+        """Field id, display name, or any case/spacing variant of the name."""
+        return self._by_id.get(key) or self._specs.get(key) or self._by_canonical.get(canonical(key))
+
+    def name_of(self, field_id: str) -> str:
+        spec = self._by_id.get(field_id)
+        return spec.name if spec else field_id
+
+    def output_schema(self, field_ids: List[str] | None = None) -> Dict[str, Any]:
+        """JSON schema of the object the LLM returns, keyed by display name;
+        ``field_ids`` narrows it to just those fields."""
+        specs = [self._by_id[f] for f in field_ids if f in self._by_id] if field_ids else list(self._specs.values())
+        return {
+            "type": "object",
+            "properties": {s.name: s.json_schema() for s in specs},
+            "required": [s.name for s in specs if field_ids or s.required],
+        }
+
+    def validate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Coerce a ``{field_id: value}`` payload to Jira shapes. Unknown ids pass
+        through untouched. Raises ``FieldValidationError`` listing every bad field.
+        """
+        out: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for fid, value in payload.items():
+            spec = self._by_id.get(fid)
+            if spec is None or spec.type in _PASSTHROUGH_TYPES:
+                out[fid] = value
+                continue
+            if value in (None, "", [], {}):
+                if spec.required:
+                    errors[fid] = f"'{spec.name}' is required"
+                continue
+            try:
+                out[fid] = spec.coerce(value)
+            except ValueError as exc:
+                errors[fid] = f"'{spec.name}': {exc}"
+        if errors:
+            raise FieldValidationError(errors)
+        return out
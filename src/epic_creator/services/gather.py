@@ -0,0 +1,88 @@
+###############################################################################
+# Concurrent "gather context" stage                                           #
+###############################################################################
+from __future__ import annotations
+
+import contextvars
+import os
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from .context import FeatureContextService
+from .field_meta import FieldMetadataService
+
+
+def default_call_timeout() -> float:
+    return float(os.environ.get("EPIC_CREATOR_CALL_TIMEOUT", 20))
+
+
+@dataclass
+class EpicContext:
+    """Everything the LLM and the mapper need before a draft can be generated."""
+    fields: Dict[str, Any]
+    project_info: Dict[str, str]
+    recent_epics: List[Dict[str, Any]]
+    account_id: str | None = None
+    related: List[Dict[str, Any]] = field(default_factory=list)   # epics closest to the prompt
+
+
+def run_concurrently(
+    calls: Dict[str, Callable[[], Any]],
+    timeout: float | None = None,
+) -> Dict[str, Any]:
+    """
+    Run independent zero-arg callables in parallel and return ``{name: result}``.
+
+    Fails fast: the first exception is re-raised as soon as it happens and the
+    remaining calls are abandoned. A call still running after ``timeout``
+    seconds (default ``EPIC_CREATOR_CALL_TIMEOUT``, 20) raises ``TimeoutError``.
+    """
+    if timeout is None:
+        timeout = default_call_timeout()
+    pool = ThreadPoolExecutor(max_workers=max(1, len(calls)), thread_name_prefix="gather")
+    # copy_context so trace spans opened in the workers nest under the caller's
+    futures = {pool.submit(contextvars.copy_context().run, fn): name for name, fn in calls.items()}
+    try:
+        done, pending = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        for fut in done:
+            exc = fut.exception()
+            if exc is not None:
+                raise exc
+        if pending:
+            names = ", ".join(sorted(futures[f] for f in pending))
+            raise TimeoutError(f"Context calls exceeded {timeout}s: {names}")
+        return {futures[f]: f.result() for f in done}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def gather_context(
+    field_service: FieldMetadataService,
+    context_service: FeatureContextService,
+    project_key: str,
+    include_user: bool = True,
+    timeout: float | None = None,
+    manager_prompt: str | None = None,
+) -> EpicContext:
+    """
+    Fetch field metadata, project overview, example epics and (optionally) the
+    caller's account id at the same time. Inside ``get_epic_fields`` only the
+    createmeta-by-id call waits on the issuetypes call.
+
+    With ``manager_prompt`` the examples are the project's newest epics from
+    the local store (stable, for the cached prompt prefix) and ``related`` holds
+    the most similar ones from the local index.
+    """
+    calls: Dict[str, Callable[[], Any]] = {
+        "fields": lambda: field_service.get_epic_fields(project_key),
+        "project_info": lambda: context_service.get_project_overview(project_key),
+    }
+    if manager_prompt:
+        calls["related"] = lambda: context_service.get_relevant_epics(project_key, manager_prompt)
+        calls["recent_epics"] = lambda: context_service.get_example_epics(project_key)
+    else:
+        calls["recent_epics"] = lambda: context_service.get_recent_epics(project_key)
+    if include_user:
+        calls["account_id"] = field_service.get_user_id
+    return EpicContext(**run_concurrently(calls, timeout))
@@ -1,11 +1,26 @@
 ###############################################################################
 # 3. Prompt Engineering & LLM Service                                         #
 ###############################################################################
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator
+
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+
+from ..scheduler import Scheduler, get_default_scheduler
+from ..tracing import enabled as tracing_enabled, span
+from .llm_cache import LLMResultCache, get_default_llm_cache
+from .llm_router import ModelRouter, router_from_env
+from .prompt_budget import PromptBudgeter, default_prompt_budget, PromptBuild, PromptPrefixCache
+
+if TYPE_CHECKING:       # langchain is imported on first use, not with this module
+    from langchain_core.language_models import BaseChatModel
 
 
 class EpicOutput(BaseModel):
@@ -15,7 +30,49 @@ class EpicOutput(BaseModel):
     labels: List[str] = Field(description="List of labels")
 
 
-parser = JsonOutputParser(pydantic_object=EpicOutput)
+@functools.lru_cache(maxsize=None)
+def _parser():
+    from langchain_core.output_parsers import JsonOutputParser
+    return JsonOutputParser(pydantic_object=EpicOutput)
+
+
+def __getattr__(name: str) -> Any:
+    # ``parser`` used to be a module global; keep ``llm.parser`` working lazily
+    if name == "parser":
+        return _parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _usage_callback_cls() -> type:
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class _UsageCallback(BaseCallbackHandler):
+        """Sums token usage off the final chat messages (only attached while tracing)."""
+
+        def __init__(self) -> None:
+            self.usage: Dict[str, Any] = {}
+            self._lock = threading.Lock()        # batch() reports from several threads
+
+        def on_llm_end(self, response, **kwargs: Any) -> None:
+            for generations in response.generations:
+                for gen in generations:
+                    usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+                    if usage:
+                        # prompt tokens the provider served from its prefix cache
+                        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                        with self._lock:
+                            for k in ("input_tokens", "output_tokens"):
+                                self.usage[k] = self.usage.get(k, 0) + (usage.get(k) or 0)
+                            self.usage["cached_tokens"] = self.usage.get("cached_tokens", 0) + cached
+
+        def report(self, sp) -> None:
+            if self.usage:
+                sp.set(prompt_tokens=self.usage.get("input_tokens"),
+                       completion_tokens=self.usage.get("output_tokens"),
+                       cached_tokens=self.usage.get("cached_tokens"))
+
+    return _UsageCallback
 
 
 class LLMService:
@@ -25,11 +82,56 @@ class LLMService:
         "Return *only* JSON that matches the schema."
     )
 
-    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.3):
-        self.llm = ChatOpenAI(model_name=model_name, temperature=temperature)
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        temperature: float = 0.3,
+        cache: LLMResultCache | None = None,
+        llm: BaseChatModel | None = None,
+        router: ModelRouter | None = None,
+        scheduler: Scheduler | None = None,
+    ):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.cache = cache
+        # every model call takes an "llm" slot; with a router each attempt takes
+        # its own, from the router's scheduler
+        self.scheduler = scheduler or get_default_scheduler()
+        # ``llm`` lets benchmarks / tests plug in any LangChain chat model;
+        # ``router`` replaces the single model with hedged / fallback routes
+        self._llm = llm
+        self.router = router
+        self._chain = None
+        self._chain_lock = threading.Lock()
+        self.prefix_cache = PromptPrefixCache()
+
+    @property
+    def llm(self) -> BaseChatModel:
+        if self.router is not None:
+            return self.router.routes[0].llm
+        if self._llm is None:
+            self.chain                      # builds the default ChatOpenAI client
+        return self._llm
 
-        # Build a reusable chained runnable:  Prompt -> Model -> JSON-Parser
-        self.chain = (
+    @property
+    def chain(self):
+        """Prompt -> Model -> JSON-Parser, built (and langchain imported) on first use.
+        With a router: the same chain per route, behind ``RoutedChain``."""
+        if self._chain is None:
+            with self._chain_lock:
+                if self._chain is None:
+                    if self.router is not None:
+                        self._chain = self.router.bind(self._build_chain)
+                    else:
+                        if self._llm is None:
+                            from langchain_openai import ChatOpenAI
+                            self._llm = ChatOpenAI(model_name=self.model_name, temperature=self.temperature)
+                        self._chain = self._build_chain(self._llm)
+        return self._chain
+
+    def _build_chain(self, llm: BaseChatModel):
+        from langchain_core.prompts import ChatPromptTemplate
+        return (
             ChatPromptTemplate.from_messages(
                 [
                     ("system", self.SYSTEM_PROMPT),
@@ -37,8 +139,8 @@ class LLMService:
                     ("user", "{prompt}"),
                 ]
             )
-            | self.llm
-            | parser            # automatically parses .content into EpicOutput
+            | llm
+            | _parser()         # automatically parses .content into EpicOutput
         )
 
     # --------------------------------------------------------------------- #
@@ -64,8 +166,144 @@ class LLMService:
             f"Return a JSON object with keys in Field requirements"
         )
 
+    def build_budgeted_prompt(
+        self,
+        field_requirements: Dict[str, Any],
+        project_info: Dict[str, str],
+        examples: List[Dict[str, Any]],
+        user_requirements: str,
+        token_budget: int | None = None,
+        issue_type: str = "epic",
+        related: List[Dict[str, Any]] | None = None,
+        project_key: str | None = None,
+    ) -> PromptBuild:
+        """Like ``build_prompt`` but only LLM-fillable fields, compact examples,
+        trimmed to ``token_budget``; ``.tokens`` reports the final size.
+
+        Project, fields and ``examples`` form a prefix that is identical across
+        drafts (memoised per ``project_key``), so provider prompt caching can
+        hit; ``related`` epics and the requirement follow it."""
+        if token_budget is None:
+            token_budget = default_prompt_budget()
+        budgeter = PromptBudgeter(token_budget, self.model_name, self.SYSTEM_PROMPT)
+        prefix = None
+        if project_key is not None:
+            prefix = self.prefix_cache.get_or_build(
+                (project_key, issue_type, token_budget), field_requirements, project_info, examples,
+                lambda: budgeter.build_prefix(field_requirements, project_info, examples),
+            )
+        return budgeter.build(field_requirements, project_info, examples, user_requirements,
+                              issue_type, related, prefix)
+
     # --------------------------------------------------------------------- #
     # Single entry-point the rest of your code calls                         #
     # --------------------------------------------------------------------- #
-    def generate_epic(self, prompt: str) -> EpicOutput:
-        return self.chain.invoke({"prompt": prompt})  # returns EpicOutput
\ No newline at end of file
+    def generate_epic(self, prompt: str, regenerate: bool = False) -> EpicOutput:
+        """``regenerate=True`` skips the cache and stores the fresh draft."""
+        with span("llm.generate", model=self.model_name, cached=self.cache is not None) as sp:
+            def invoke() -> EpicOutput:
+                sp.set(cached=False)
+                return self._invoke(prompt, sp)
+
+            if self.cache is None:
+                return invoke()
+            key = LLMResultCache.make_key(self.model_name, self.temperature, self.SYSTEM_PROMPT, prompt)
+            return self.cache.get_or_compute(key, invoke, bypass=regenerate)
+
+    def repair_fields(self, prompt: str) -> Dict[str, Any]:
+        """Answer a ``services/repair.py`` prompt – a few fields, never cached."""
+        with span("llm.repair", model=self.model_name) as sp:
+            return self._invoke(prompt, sp)
+
+    def _slot(self):
+        return contextlib.nullcontext() if self.router is not None else self.scheduler.slot("llm")
+
+    def _invoke(self, prompt: str, sp) -> Dict[str, Any]:
+        if not tracing_enabled():
+            with self._slot():
+                return self.chain.invoke({"prompt": prompt})  # returns EpicOutput
+        usage = _usage_callback_cls()()
+        with self._slot():
+            result = self.chain.invoke({"prompt": prompt}, config={"callbacks": [usage]})
+        usage.report(sp)
+        return result
+
+    def generate_many(self, prompts: List[str], max_concurrency: int = 8,
+                      cached: bool = True) -> List[Dict[str, Any] | Exception]:
+        """
+        ``generate_epic`` for many prompts at once: cache hits are served
+        directly, the rest run at most ``max_concurrency`` at a time, each
+        taking its own "llm" slot so a large batch queues behind other users
+        fairly. A failed prompt (shed ones included) yields its exception in
+        place of a draft, so one bad answer never sinks the rest.
+        ``cached=False`` bypasses the result cache (repair prompts).
+        """
+        keys = [LLMResultCache.make_key(self.model_name, self.temperature, self.SYSTEM_PROMPT, p)
+                for p in prompts] if self.cache is not None and cached else [None] * len(prompts)
+        results: List[Any] = [self.cache.get(k) if k else None for k in keys]
+        todo = [i for i, r in enumerate(results) if r is None]
+        with span("llm.batch", model=self.model_name, size=len(prompts), cache_hits=len(prompts) - len(todo)) as sp:
+            if todo:
+                usage = _usage_callback_cls()() if tracing_enabled() else None
+                config = {"callbacks": [usage]} if usage else None
+
+                def one(i: int) -> Any:
+                    try:
+                        with self._slot():
+                            return self.chain.invoke({"prompt": prompts[i]}, config=config)
+                    except Exception as exc:
+                        return exc
+
+                with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(todo))),
+                                        thread_name_prefix="llm-batch") as pool:
+                    outputs = list(pool.map(lambda i: contextvars.copy_context().run(one, i), todo))
+                if usage:
+                    usage.report(sp)
+                for i, out in zip(todo, outputs):
+                    results[i] = out
+                    if keys[i] is not None and not isinstance(out, Exception):
+                        self.cache.put(keys[i], out)
+        return results
+
+    def stream_epic(self, prompt: str, regenerate: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield progressively more complete drafts (partial JSON) as tokens arrive.
+        The last item is the same dict ``generate_epic`` would have returned.
+        """
+        key = None
+        if self.cache is not None:
+            key = LLMResultCache.make_key(self.model_name, self.temperature, self.SYSTEM_PROMPT, prompt)
+            cached = None if regenerate else self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        draft: Dict[str, Any] = {}
+        with span("llm.stream", model=self.model_name) as sp:
+            usage = _usage_callback_cls()() if tracing_enabled() else None
+            config = {"callbacks": [usage]} if usage else None
+            t0 = time.perf_counter()
+            with self._slot():                          # held until the stream ends or is closed
+                for n, draft in enumerate(self.chain.stream({"prompt": prompt}, config=config)):
+                    if n == 0:
+                        sp.set(first_partial_ms=round((time.perf_counter() - t0) * 1000, 1))
+                    yield draft
+            if usage:
+                usage.report(sp)
+        if key is not None and draft:
+            self.cache.put(key, draft)
+
+
+_default_services: Dict[tuple, LLMService] = {}
+_default_lock = threading.Lock()
+
+
+def get_default_llm_service(model_name: str = "gpt-4o-mini", temperature: float = 0.3) -> LLMService:
+    """Process-wide service per model: one chat client, one chain, the shared result cache.
+    ``EPIC_CREATOR_LLM_ROUTES`` swaps the single model for a hedged router."""
+    key = (model_name, temperature)
+    with _default_lock:
+        if key not in _default_services:
+            _default_services[key] = LLMService(model_name, temperature, cache=get_default_llm_cache(),
+                                                router=router_from_env(temperature))
+        return _default_services[key]
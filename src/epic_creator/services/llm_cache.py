@@ -0,0 +1,139 @@
+###############################################################################
+# LLM Result Cache (content-addressed, LRU + optional SQLite tier)            #
+###############################################################################
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from ..store import SqliteKV, default_cache_dir
+
+
+class LLMResultCache:
+    """
+    Parsed drafts keyed by a hash of everything that determines the output
+    (model, temperature, system prompt, prompt text).
+
+    Identical requests that arrive while the first one is still running wait
+    for it instead of calling the model again.
+    """
+
+    def __init__(self, max_entries: int = 256, path: str | Path | None = None, max_disk_entries: int = 5000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._mem: "OrderedDict[str, Any]" = OrderedDict()
+        self._disk = SqliteKV(path, table="llm_results") if path else None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0}
+
+    @staticmethod
+    def make_key(model_name: str, temperature: float, system_prompt: str, prompt: str) -> str:
+        blob = json.dumps([model_name, temperature, system_prompt, prompt], ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], bypass: bool = False) -> Any:
+        """Return the cached value for ``key`` or run ``compute`` once for all waiters.
+        ``bypass`` always calls ``compute`` and replaces whatever was cached."""
+        if bypass:
+            self._count("bypassed")
+            value = compute()
+            self._put(key, value)
+            return copy.deepcopy(value)
+
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(self._mem[key])
+            waiting = self._inflight.get(key)
+            if waiting is None:
+                waiting = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+                self._stats["coalesced"] += 1
+        if not owner:
+            return copy.deepcopy(waiting.result())
+
+        try:
+            entry = self._disk.get(key) if self._disk else None
+            if entry is not None:
+                self._count("hits")
+                value = entry[0]
+                self._put(key, value, to_disk=False)
+            else:
+                self._count("misses")
+                value = compute()
+                self._put(key, value)
+            waiting.set_result(value)
+        except BaseException as exc:
+            waiting.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return copy.deepcopy(value)
+
+    def get(self, key: str) -> Any | None:
+        """Plain lookup (memory, then disk) without computing anything."""
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(self._mem[key])
+        entry = self._disk.get(key) if self._disk else None
+        if entry is None:
+            return None
+        self._count("hits")
+        self._put(key, entry[0], to_disk=False)
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: str, value: Any) -> None:
+        self._put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+        if self._disk:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._mem))
+
+    # ------------------------------------------------------------------ #
+    def _put(self, key: str, value: Any, to_disk: bool = True) -> None:
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+        if self._disk and to_disk:
+            self._disk.put(key, value)
+            self._disk.prune(self.max_disk_entries)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_default_cache: LLMResultCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_llm_cache() -> LLMResultCache:
+    """Process-wide cache; set ``EPIC_CREATOR_LLM_CACHE_DISK=1`` to persist drafts."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            disk = os.environ.get("EPIC_CREATOR_LLM_CACHE_DISK", "").lower() in ("1", "true", "yes")
+            _default_cache = LLMResultCache(path=default_cache_dir() / "llm.sqlite" if disk else None)
+        return _default_cache
@@ -0,0 +1,299 @@
+###############################################################################
+# Hedged, tiered model routing                                                #
+###############################################################################
+"""
+    router = ModelRouter([ModelRoute("gpt-4o-mini", mini, timeout=20),
+                          ModelRoute("gpt-4o", big, timeout=30)])
+    LLMService(router=router)
+
+Routes are tried in order. Each attempt has its own deadline; an attempt that
+raises, times out or returns something that is not a JSON object starts the
+next route. With ``hedge`` on, a second attempt is fired once the first has
+run longer than the primary route's recent p95 (the next route, or the same
+one again when there is only one) and whichever valid answer arrives first
+wins. Every attempt is recorded as an ``llm.attempt`` span with its outcome
+(won / lost / failed / timeout, or late for a timed-out attempt that answered
+after all) and counted once in ``stats()``. Each attempt takes its own "llm"
+scheduler slot, so hedges and abandoned attempts count against the limit.
+
+    EPIC_CREATOR_LLM_ROUTES=gpt-4o-mini:20,gpt-4o:30    # model[:timeout s], in order
+    EPIC_CREATOR_LLM_HEDGE=0                            # fallback only, no hedging
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List
+
+from ..scheduler import Overloaded, Scheduler, get_default_scheduler
+from ..tracing import span
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+DEFAULT_ATTEMPT_TIMEOUT = 30.0
+DEFAULT_HEDGE_DELAY = 4.0         # until a route has enough samples for a p95
+
+
+class LLMRouteError(RuntimeError):
+    """Every route failed or timed out; ``errors`` lists ``"route: reason"`` per attempt."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("all model routes failed: " + "; ".join(errors))
+        self.errors = errors
+
+
+@dataclass
+class ModelRoute:
+    name: str
+    llm: BaseChatModel
+    timeout: float = DEFAULT_ATTEMPT_TIMEOUT
+
+
+class _Attempt:
+    __slots__ = ("route", "chain", "hedge", "start", "state")
+
+    def __init__(self, route: ModelRoute, chain: Any, hedge: bool):
+        self.route = route
+        self.chain = chain
+        self.hedge = hedge
+        self.start = time.perf_counter()
+        self.state = "running"              # → won / lost / failed / timeout
+
+
+class _Race:
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.winner: _Attempt | None = None
+        self.result: Any = None
+        self.errors: List[str] = []
+        self.shed: List[Overloaded] = []     # attempts the scheduler turned away
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        routes: List[ModelRoute],
+        hedge: bool = True,
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        hedge_quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 32,
+        scheduler: Scheduler | None = None,
+    ):
+        if not routes:
+            raise ValueError("ModelRouter needs at least one route")
+        self.routes = list(routes)
+        self.hedge = hedge
+        self.default_hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.scheduler = scheduler or get_default_scheduler()
+        self._latency: Dict[str, Deque[float]] = {r.name: deque(maxlen=window) for r in self.routes}
+        self._counts: Dict[str, Dict[str, int]] = {
+            r.name: dict.fromkeys(("won", "lost", "failed", "timeout"), 0) for r in self.routes
+        }
+        self._stats_lock = threading.Lock()
+        # attempts that lose or time out keep their thread until the model returns
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-route")
+
+    # ------------------------------------------------------------------ #
+    def bind(self, build_chain: Callable[[BaseChatModel], Any]) -> "RoutedChain":
+        """Chains (prompt | model | parser) per route, behind the chain interface LLMService uses."""
+        return RoutedChain(self, [(route, build_chain(route.llm)) for route in self.routes])
+
+    def hedge_delay(self, route: ModelRoute) -> float:
+        """p95 of the route's recent successful latencies, or the default while it has too few."""
+        with self._stats_lock:
+            samples = sorted(self._latency[route.name])
+        if len(samples) < self.min_samples:
+            return self.default_hedge_delay
+        return samples[min(len(samples) - 1, int(self.hedge_quantile * len(samples)))]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._stats_lock:
+            out = {}
+            for name, counts in self._counts.items():
+                samples = sorted(self._latency[name])
+                out[name] = dict(counts)
+                if samples:
+                    out[name]["p50_ms"] = round(statistics.median(samples) * 1000, 1)
+                    out[name]["p95_ms"] = round(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, 1)
+            return out
+
+    def _record(self, route: ModelRoute, outcome: str | None, latency: float | None = None) -> None:
+        with self._stats_lock:
+            if outcome is not None:
+                self._counts[route.name][outcome] += 1
+            if latency is not None:
+                self._latency[route.name].append(latency)
+
+    # ------------------------------------------------------------------ #
+    def run(self, chains: List[tuple], call: Callable[[Any], Any]) -> Any:
+        """``call(chain)`` on the first route, hedging / falling back as configured."""
+        race = _Race()
+        queue = list(chains)
+        attempts: List[_Attempt] = []
+        primary, _ = chains[0]
+        hedged = not self.hedge
+        seen_failures = 0
+
+        def launch(route: ModelRoute, chain: Any, hedge: bool = False) -> None:
+            attempt = _Attempt(route, chain, hedge)
+            attempts.append(attempt)
+            self._pool.submit(contextvars.copy_context().run, self._attempt, race, attempt, call)
+
+        with race.cond:
+            launch(*queue.pop(0))
+            hedge_at = attempts[0].start + self.hedge_delay(primary)
+            while True:
+                if race.winner is not None:
+                    for a in attempts:
+                        if a.state == "running":
+                            a.state = "lost"
+                    return race.result
+                now = time.perf_counter()
+                for a in attempts:
+                    if a.state == "running" and now >= a.start + a.route.timeout:
+                        a.state = "timeout"
+                        race.errors.append(f"{a.route.name}: no answer within {a.route.timeout:g}s")
+                        self._record(a.route, "timeout")
+                # one fallback per failed / timed-out attempt
+                while seen_failures < len(race.errors) and queue:
+                    launch(*queue.pop(0))
+                    seen_failures += 1
+                seen_failures = len(race.errors)
+                running = [a for a in attempts if a.state == "running"]
+                if not hedged and running and now >= hedge_at:
+                    hedged = True
+                    launch(*(queue.pop(0) if queue else chains[0]), hedge=True)
+                    running = [a for a in attempts if a.state == "running"]
+                if not running:
+                    if len(race.shed) == len(attempts):      # never reached a model: report the load
+                        raise race.shed[0]
+                    raise LLMRouteError(race.errors)
+                wake = min(a.start + a.route.timeout for a in running)
+                if not hedged:
+                    wake = min(wake, hedge_at)
+                race.cond.wait(max(0.0, wake - time.perf_counter()))
+
+    def _attempt(self, race: _Race, attempt: _Attempt, call: Callable[[Any], Any]) -> None:
+        route = attempt.route
+        with span("llm.attempt", route=route.name, hedge=attempt.hedge) as sp:
+            error = shed = None
+            try:
+                with self.scheduler.slot("llm"):
+                    result = call(attempt.chain)
+                if not isinstance(result, dict):
+                    raise ValueError(f"expected a JSON object, got {type(result).__name__}")
+            except Overloaded as exc:
+                error, shed = f"{type(exc).__name__}: {exc}", exc
+            except Exception as exc:            # parse errors included: they fall back too
+                error = f"{type(exc).__name__}: {exc}"
+            latency = time.perf_counter() - attempt.start
+            with race.cond:
+                if attempt.state == "running":
+                    if error is not None:
+                        outcome = attempt.state = "failed"
+                        race.errors.append(f"{route.name}: {error}")
+                        if shed is not None:
+                            race.shed.append(shed)
+                    elif race.winner is None:
+                        outcome = attempt.state = "won"
+                        race.winner, race.result = attempt, result
+                    else:
+                        outcome = attempt.state = "lost"
+                else:                               # the router already moved on without it
+                    outcome = "late" if attempt.state == "timeout" else "lost"
+                race.cond.notify_all()
+            sp.set(outcome=outcome, latency_ms=round(latency * 1000, 1), error=error)
+            # a late attempt was already counted as "timeout"; its latency still feeds the p95
+            self._record(route, None if outcome == "late" else outcome, latency if error is None else None)
+
+
+class RoutedChain:
+    """Duck-types the ``invoke`` / ``batch`` / ``stream`` of a LangChain chain."""
+
+    def __init__(self, router: ModelRouter, chains: List[tuple]):
+        self.router = router
+        self.chains = chains
+
+    def invoke(self, inputs: Dict[str, Any], config: Dict[str, Any] | None = None) -> Any:
+        return self.router.run(self.chains, lambda chain: chain.invoke(inputs, config=config))
+
+    def batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        config: Dict[str, Any] | None = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        config = dict(config or {})
+        workers = config.pop("max_concurrency", None) or len(inputs) or 1
+
+        def one(item: Dict[str, Any]) -> Any:
+            try:
+                return self.invoke(item, config)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                return exc
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-batch") as pool:
+            return list(pool.map(lambda item: contextvars.copy_context().run(one, item), inputs))
+
+    def stream(self, inputs: Dict[str, Any], config: Dict[str, Any] | None = None) -> Iterator[Any]:
+        """No hedging for streams: the next route takes over if one fails or
+        ends without a JSON object before anything was passed on."""
+        errors: List[str] = []
+        for route, chain in self.chains:
+            yielded = False
+            last: Any = None
+            start = time.perf_counter()
+            try:
+                with self.router.scheduler.slot("llm"):
+                    for chunk in chain.stream(inputs, config=config):
+                        last = chunk
+                        if isinstance(chunk, dict):     # partial JSON objects only
+                            yielded = True
+                            yield chunk
+                if not isinstance(last, dict):
+                    raise ValueError("stream ended without a JSON object" if last is None
+                                     else f"expected a JSON object, got {type(last).__name__}")
+            except Overloaded:
+                raise                               # every route shares the limit
+            except Exception as exc:
+                self.router._record(route, "failed")
+                if yielded:                         # the caller already has part of this answer
+                    raise
+                errors.append(f"{route.name}: {type(exc).__name__}: {exc}")
+                continue
+            self.router._record(route, "won", time.perf_counter() - start)
+            return
+        raise LLMRouteError(errors)
+
+
+def routes_from_env(temperature: float) -> List[ModelRoute]:
+    """``EPIC_CREATOR_LLM_ROUTES`` as ``ChatOpenAI`` routes; empty when unset."""
+    spec = os.environ.get("EPIC_CREATOR_LLM_ROUTES", "")
+    routes = []
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        name, _, timeout = item.partition(":")
+        timeout_s = float(timeout) if timeout else DEFAULT_ATTEMPT_TIMEOUT
+        from langchain_openai import ChatOpenAI
+        routes.append(ModelRoute(name, ChatOpenAI(model_name=name, temperature=temperature,
+                                                  timeout=timeout_s, max_retries=0), timeout_s))
+    return routes
+
+
+def router_from_env(temperature: float) -> ModelRouter | None:
+    routes = routes_from_env(temperature)
+    if not routes:
+        return None
+    return ModelRouter(routes, hedge=os.environ.get("EPIC_CREATOR_LLM_HEDGE", "1") not in ("0", "false", "no"))
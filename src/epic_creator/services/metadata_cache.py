@@ -0,0 +1,185 @@
+###############################################################################
+# Field Metadata Cache (memory + SQLite, stale-while-revalidate)              #
+###############################################################################
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from ..store import SqliteKV, default_cache_dir
+
+log = logging.getLogger(__name__)
+
+DEFAULT_STALE_TTL = 7 * 24 * 3600
+
+
+def default_ttl() -> float:
+    return float(os.environ.get("EPIC_CREATOR_META_TTL", 24 * 3600))
+
+
+class MetadataCache:
+    """
+    Caches per-project Epic field metadata keyed by ``(base_url, project_key)``.
+
+    * fresh (age < ``ttl``)           → served from memory, no request
+    * stale (age < ``stale_ttl``)     → served immediately, refreshed in a background thread
+    * expired / missing / ``force``   → loaded synchronously
+
+    Values derived from an entry (``derived``) and per-site memos (``site_memo``)
+    live here too, so ``invalidate`` drops them with the entries they came from.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float | None = None,
+        stale_ttl: float | None = DEFAULT_STALE_TTL,
+        background: bool = True,
+    ):
+        ttl = ttl if ttl is not None else default_ttl()
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl or ttl)
+        self.background = background
+        self._disk = SqliteKV(path or default_cache_dir() / "metadata.sqlite", table="field_meta")
+        self._mem: Dict[str, Tuple[Any, float]] = {}
+        self._derived: Dict[str, Tuple[Any, Any]] = {}          # key → (source value, derived value)
+        self._sites: Dict[str, Dict[str, Any]] = {}             # base_url → memo dict
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    @staticmethod
+    def key(base_url: str, project_key: str) -> str:
+        return f"{base_url.rstrip('/')}|{project_key}"
+
+    # ------------------------------------------------------------------ #
+    def get_or_load(
+        self,
+        base_url: str,
+        project_key: str,
+        loader: Callable[[], Any],
+        force: bool = False,
+    ) -> Any:
+        key = self.key(base_url, project_key)
+        entry = None if force else self._lookup(key)
+
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self._count("hits")
+                return value
+            if age < self.stale_ttl:
+                self._count("stale_hits")
+                if self.background:
+                    self._revalidate(key, loader)
+                    return value
+
+        self._count("misses")
+        value = loader()
+        self._store(key, value)
+        return value
+
+    def derived(self, base_url: str, project_key: str, value: Any, build: Callable[[Any], Any]) -> Any:
+        """``build(value)`` for the entry's current ``value``, built once per load
+        (e.g. a compiled ``FieldSchema``)."""
+        key = self.key(base_url, project_key)
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is not None and entry[0] is value:
+                return entry[1]
+        result = build(value)
+        with self._lock:
+            self._derived[key] = (value, result)
+        return result
+
+    def site_memo(self, base_url: str) -> Dict[str, Any]:
+        """Mutable per-site dict (e.g. ``/field`` entries); emptied by any ``invalidate`` of the site."""
+        with self._lock:
+            return self._sites.setdefault(base_url.rstrip("/"), {})
+
+    def invalidate(self, base_url: str | None = None, project_key: str | None = None) -> None:
+        """Drop one project, every project of a site, or (no args) everything.
+        The site's memo goes too: a renamed custom field affects every project."""
+        with self._lock:
+            if base_url is None:
+                self._mem.clear()
+                self._derived.clear()
+                self._sites.clear()
+                self._disk.clear()
+                return
+            self._sites.pop(base_url.rstrip("/"), None)
+            if project_key is None:
+                prefix = self.key(base_url, "")
+                for store in (self._mem, self._derived):
+                    for k in [k for k in store if k.startswith(prefix)]:
+                        del store[k]
+                self._disk.delete_prefix(prefix)
+            else:
+                key = self.key(base_url, project_key)
+                self._mem.pop(key, None)
+                self._derived.pop(key, None)
+                self._disk.delete(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._mem))
+
+    # ------------------------------------------------------------------ #
+    def _lookup(self, key: str) -> Tuple[Any, float] | None:
+        with self._lock:
+            entry = self._mem.get(key)
+        if entry is None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                with self._lock:
+                    self._mem[key] = entry
+        return entry
+
+    def _store(self, key: str, value: Any) -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._mem[key] = (value, stored_at)
+        self._disk.put(key, value, stored_at)
+
+    def _revalidate(self, key: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self._store(key, loader())
+                self._count("refreshes")
+            except Exception:  # keep serving the stale copy
+                self._count("errors")
+                log.warning("background refresh of %s failed", key, exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,),
+                         name=f"meta-refresh:{key}", daemon=True).start()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_default_cache: MetadataCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> MetadataCache:
+    """Process-wide cache shared by the orchestrator and the Streamlit app."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = MetadataCache()
+        return _default_cache
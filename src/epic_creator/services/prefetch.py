@@ -0,0 +1,103 @@
+###############################################################################
+# Multi-project metadata prefetcher                                           #
+###############################################################################
+"""
+Keeps Epic field metadata (and project overviews) hot for a known list of
+projects, so the first draft of the day in any of them hits the cache.
+
+    EPIC_CREATOR_PREFETCH_PROJECTS=PROJ,OTHER      # projects to keep warm
+    EPIC_CREATOR_PREFETCH_INTERVAL=21600           # seconds between runs (default: half the metadata TTL)
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from ..jiraClient import JiraClient
+from ..tracing import span
+from .context import FeatureContextService
+from .epic_store import get_default_epic_store
+from .field_meta import FieldMetadataService
+from .metadata_cache import MetadataCache, get_default_cache
+
+log = logging.getLogger(__name__)
+
+
+class MetadataPrefetcher:
+    """``warm()`` once, or ``start()`` to re-warm every ``interval`` seconds on a daemon thread."""
+
+    def __init__(
+        self,
+        jira_client: JiraClient,
+        project_keys: Iterable[str],
+        cache: MetadataCache | None = None,
+        interval: float | None = None,
+        concurrency: int = 8,
+        overviews: bool = True,
+    ):
+        self.jira_client = jira_client
+        self.project_keys: List[str] = list(dict.fromkeys(project_keys))
+        self.cache = cache or get_default_cache()
+        self.interval = interval if interval is not None else self.cache.ttl / 2
+        self.concurrency = concurrency
+        self.overviews = overviews
+        self.last_run: float | None = None
+        self.last_errors: Dict[str, str | None] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def warm(self, refresh: bool = True) -> Dict[str, str | None]:
+        """Fetch every project's metadata now; returns ``{project: error or None}``."""
+        with span("prefetch", projects=len(self.project_keys)):
+            fields = FieldMetadataService(self.jira_client, cache=self.cache)
+            errors = fields.prefetch(self.project_keys, self.concurrency, refresh=refresh)
+            if self.overviews:
+                context = FeatureContextService(self.jira_client, store=get_default_epic_store(), cache=self.cache)
+                with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="prefetch") as pool:
+                    futures = {
+                        pk: pool.submit(contextvars.copy_context().run, context.get_project_overview, pk, refresh)
+                        for pk, err in errors.items() if err is None
+                    }
+                    for pk, fut in futures.items():
+                        try:
+                            fut.result()
+                        except Exception as exc:
+                            errors[pk] = str(exc)
+        self.last_run, self.last_errors = time.time(), errors
+        for pk, err in errors.items():
+            if err:
+                log.warning("prefetch of %s failed: %s", pk, err)
+        return errors
+
+    def start(self) -> "MetadataPrefetcher":
+        """Warm immediately in the background, then every ``interval`` seconds."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="metadata-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.warm()
+            except Exception:
+                log.warning("metadata prefetch run failed", exc_info=True)
+            self._stop.wait(self.interval)
+
+
+def start_from_env(jira_client: JiraClient) -> MetadataPrefetcher | None:
+    """Start a prefetcher for ``EPIC_CREATOR_PREFETCH_PROJECTS``; ``None`` if unset."""
+    projects = [p.strip() for p in os.environ.get("EPIC_CREATOR_PREFETCH_PROJECTS", "").split(",") if p.strip()]
+    if not projects:
+        return None
+    interval = os.environ.get("EPIC_CREATOR_PREFETCH_INTERVAL")
+    return MetadataPrefetcher(jira_client, projects, interval=float(interval) if interval else None).start()
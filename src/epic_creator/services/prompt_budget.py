@@ -0,0 +1,263 @@
+###############################################################################
+# Token-budgeted prompt assembly                                              #
+###############################################################################
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+
+def default_prompt_budget() -> int:
+    return int(os.environ.get("EPIC_CREATOR_PROMPT_BUDGET", 1500))
+
+
+# Fields the mapper sets itself (or the LLM cannot know) – never worth prompt tokens.
+NON_LLM_FIELD_IDS = frozenset({"project", "issuetype", "reporter", "assignee", "attachment", "issuelinks", "parent"})
+NON_LLM_SCHEMA_TYPES = frozenset({"project", "issuetype", "user", "attachment", "issuelinks"})
+
+
+@functools.lru_cache(maxsize=8)
+def _encoder(model_name: str) -> Callable[[str], int] | None:
+    try:
+        import tiktoken
+        try:
+            enc = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            enc = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(enc.encode(text))
+    except Exception:          # tiktoken missing or its BPE files cannot be downloaded
+        return None
+
+
+def count_tokens(text: str, model_name: str = "gpt-4o-mini") -> int:
+    """Exact with ``tiktoken``; otherwise the usual ~4 characters per token."""
+    encode = _encoder(model_name)
+    return encode(text) if encode else (len(text) + 3) // 4
+
+
+def llm_fillable_fields(field_requirements: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop system / user-reference fields the LLM cannot (or need not) fill."""
+    return {
+        name: meta for name, meta in field_requirements.items()
+        if meta["id"] not in NON_LLM_FIELD_IDS
+        and (meta.get("schema") or {}).get("type") not in NON_LLM_SCHEMA_TYPES
+    }
+
+
+@dataclass
+class PromptBuild:
+    text: str
+    tokens: int                       # prompt text + system prompt
+    budget: int
+    trimmed: List[str] = field(default_factory=list)    # what was cut, in order
+    prefix_tokens: int = 0            # system prompt + the stable per-project part
+    prefix_version: str = ""
+    prefix_reused: bool = False       # prefix came from ``PromptPrefixCache``
+
+    @property
+    def within_budget(self) -> bool:
+        return self.tokens <= self.budget
+
+
+@dataclass
+class PromptPrefix:
+    """Project, fields and examples – identical for every draft of a project, so
+    it goes first and the provider can cache it. ``version`` changes with it."""
+    text: str
+    tokens: int                       # including the system prompt
+    version: str
+    trimmed: List[str] = field(default_factory=list)
+
+
+def _truncate(text: str, chars: int) -> str:
+    if len(text) <= chars:
+        return text
+    return text[:chars].rsplit(" ", 1)[0] + " …"
+
+
+class PromptBudgeter:
+    """
+    Assembles the same sections as ``LLMService.build_prompt``, stable ones
+    first (``build_prefix``) and the requirement last, trimming the prefix,
+    lowest priority first, until the prompt fits ``budget`` tokens:
+
+    1. example descriptions (400 → 150 chars → dropped)
+    2. whole examples, last first
+    3. project description (300 chars)
+    4. optional fields
+
+    The user requirement and the required fields are never cut.
+    """
+
+    EXAMPLE_DESCRIPTION_STEPS = (400, 150, 0)
+    SUFFIX_RESERVE = 200              # tokens kept free for the requirement when a prefix is memoised
+
+    def __init__(self, budget: int | None = None, model_name: str = "gpt-4o-mini", system_prompt: str = ""):
+        self.budget = budget if budget is not None else default_prompt_budget()
+        self.model_name = model_name
+        self.system_prompt = system_prompt
+        self.system_tokens = count_tokens(system_prompt, model_name) if system_prompt else 0
+
+    def build(
+        self,
+        field_requirements: Dict[str, Any],
+        project_info: Dict[str, str],
+        examples: List[Dict[str, Any]],
+        user_requirements: str,
+        issue_type: str = "epic",
+        related: List[Dict[str, Any]] | None = None,
+        prefix: PromptPrefix | None = None,
+    ) -> PromptBuild:
+        """``prefix`` (from ``build_prefix``) is reused as-is unless the suffix
+        outgrows ``SUFFIX_RESERVE`` and the two would not fit together."""
+        in_prefix = {e.get("key") for e in examples}
+        suffix = self._render_suffix([e for e in related or () if e.get("key") not in in_prefix],
+                                     user_requirements, issue_type)
+        suffix_tokens = count_tokens(suffix, self.model_name)
+        reused = prefix is not None
+        if prefix is None or (prefix.tokens + suffix_tokens > self.budget and suffix_tokens > self.SUFFIX_RESERVE):
+            prefix = self.build_prefix(field_requirements, project_info, examples, reserve=suffix_tokens)
+            reused = False
+        return PromptBuild(prefix.text + suffix, prefix.tokens + suffix_tokens, self.budget, list(prefix.trimmed),
+                           prefix.tokens, prefix.version, reused)
+
+    def build_prefix(
+        self,
+        field_requirements: Dict[str, Any],
+        project_info: Dict[str, str],
+        examples: List[Dict[str, Any]],
+        reserve: int = SUFFIX_RESERVE,
+    ) -> PromptPrefix:
+        """The stable part, trimmed to ``budget - reserve`` tokens."""
+        limit = self.budget - reserve
+        fields = llm_fillable_fields(field_requirements)
+        project_description = project_info.get("description") or ""
+        examples = list(examples)
+        desc_chars = self.EXAMPLE_DESCRIPTION_STEPS[0]
+        trimmed: List[str] = []
+
+        def render() -> PromptPrefix:
+            text = self._render_prefix(fields, project_info, project_description, examples, desc_chars)
+            return PromptPrefix(text, self.system_tokens + count_tokens(text, self.model_name), "", trimmed)
+
+        build = render()
+        for chars in self.EXAMPLE_DESCRIPTION_STEPS[1:]:
+            if build.tokens <= limit or not examples:
+                break
+            desc_chars = chars
+            trimmed.append(f"example descriptions → {chars} chars")
+            build = render()
+        while build.tokens > limit and examples:
+            dropped = examples.pop()
+            trimmed.append(f"example {dropped.get('key', '?')}")
+            build = render()
+        if build.tokens > limit and len(project_description) > 300:
+            project_description = _truncate(project_description, 300)
+            trimmed.append("project description → 300 chars")
+            build = render()
+        if build.tokens > limit:
+            optional = [n for n, m in fields.items() if not m.get("required")]
+            if optional:
+                fields = {n: m for n, m in fields.items() if m.get("required")}
+                trimmed.append(f"optional fields: {', '.join(optional)}")
+                build = render()
+        digest = hashlib.sha256(f"{self.model_name}\0{self.system_prompt}\0{build.text}".encode("utf-8"))
+        build.version = digest.hexdigest()[:12]
+        return build
+
+    @staticmethod
+    def _render_prefix(
+        fields: Dict[str, Any],
+        project_info: Dict[str, str],
+        project_description: str,
+        examples: List[Dict[str, Any]],
+        desc_chars: int,
+    ) -> str:
+        field_lines = []
+        for name, meta in fields.items():
+            line = f"* {name} (required={meta['required']})"
+            allowed = meta.get("allowed")
+            if allowed:
+                values = [a.get("value") or a.get("name") for a in allowed if isinstance(a, dict)]
+                line += f" one of: {', '.join(v for v in values[:10] if v)}"
+            field_lines.append(line)
+
+        example_lines = []
+        for e in examples:
+            f = e.get("fields") or {}
+            line = f"- {f.get('summary', '')}"
+            if f.get("labels"):
+                line += f" [labels: {', '.join(f['labels'])}]"
+            description = f.get("description") if isinstance(f.get("description"), str) else ""
+            if desc_chars and description:
+                line += f"\n  {_truncate(description, desc_chars)}"
+            example_lines.append(line)
+
+        return (
+            f"Project: {project_info['name']}\n"
+            f"Description: {project_description}\n\n"
+            "Field requirements:\n" + "\n".join(field_lines) + "\n\n"
+            "Recent epic examples:\n" + ("\n".join(example_lines) or "(none)") + "\n\n"
+            "Return a JSON object with keys in Field requirements\n\n"
+        )
+
+    @staticmethod
+    def _render_suffix(related: List[Dict[str, Any]], user_requirements: str, issue_type: str) -> str:
+        text = ""
+        if related:
+            text = "Similar existing epics:\n" + "\n".join(
+                f"- {(e.get('fields') or {}).get('summary', '')}" for e in related) + "\n\n"
+        return text + f"New {issue_type} requirement: {user_requirements}"
+
+
+class PromptPrefixCache:
+    """
+    Memoised ``PromptPrefix`` per (project, issue type, budget). An entry is
+    reused while the field metadata object, project info and example keys it
+    was built from are unchanged – ``MetadataCache`` hands back the same dict
+    until it reloads, so the check is an identity test plus two small compares.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _sources(fields: Any, project_info: Dict[str, str], examples: List[Dict[str, Any]]) -> tuple:
+        example_sig = tuple((e.get("key"), (e.get("fields") or {}).get("updated")) for e in examples)
+        return getattr(fields, "raw", fields), dict(project_info), example_sig
+
+    def get_or_build(
+        self,
+        key: tuple,
+        fields: Any,
+        project_info: Dict[str, str],
+        examples: List[Dict[str, Any]],
+        build: Callable[[], PromptPrefix],
+    ) -> PromptPrefix:
+        raw, info, example_sig = self._sources(fields, project_info, examples)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is raw and entry[1] == info and entry[2] == example_sig:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[3]
+            self._stats["misses"] += 1
+        prefix = build()
+        with self._lock:
+            self._entries[key] = (raw, info, example_sig, prefix)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prefix
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
@@ -0,0 +1,186 @@
+###############################################################################
+# Targeted repair of incomplete / invalid LLM drafts                          #
+###############################################################################
+"""
+``map_fields`` validates a draft locally and reports every bad field at once.
+Instead of regenerating the whole epic, ``map_with_repair`` re-asks the LLM for
+just those fields – the draft's summary as context plus a JSON schema built
+from createmeta – and merges the answer into the draft. ``map_many_with_repair``
+does the same for a batch of drafts, one ``generate_many`` call per round.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ..tracing import span
+from .epic_handler import EpicCreationHandler
+from .field_schema import FieldSchema, FieldValidationError, canonical
+from .llm import LLMService
+from .prompt_budget import NON_LLM_FIELD_IDS, NON_LLM_SCHEMA_TYPES, count_tokens
+
+log = logging.getLogger(__name__)
+
+
+def default_repair_rounds() -> int:
+    return int(os.environ.get("EPIC_CREATOR_REPAIR_ROUNDS", 1))
+
+
+# always asked of the LLM, whether or not the Epic screen lists them
+_CORE_FIELDS = ("summary", "description")
+
+
+def repairable(schema: FieldSchema, field_ids: Iterable[str]) -> bool:
+    """Only fields the LLM fills can be repaired; a bad reporter or project cannot."""
+    for fid in field_ids:
+        spec = schema.by_id(fid)
+        if fid in _CORE_FIELDS:
+            continue
+        if spec is None or fid in NON_LLM_FIELD_IDS or spec.type in NON_LLM_SCHEMA_TYPES:
+            return False
+    return True
+
+
+def build_repair_prompt(
+    schema: FieldSchema,
+    draft: Dict[str, Any],
+    errors: Dict[str, str],
+    issue_type: str = "epic",
+) -> str:
+    """Just enough context to fix ``errors``: summary, a short description, the
+    problems, the affected fields and their JSON schema."""
+    lookup = {canonical(k): v for k, v in draft.items()}
+    description = str(lookup.get("description") or "")
+    if len(description) > 300:
+        description = description[:300].rsplit(" ", 1)[0] + " …"
+
+    field_lines = []
+    for fid in errors:
+        spec = schema.by_id(fid)
+        line = f"* {spec.name if spec else fid} (required=True)"
+        if spec is not None and spec.labels:
+            line += f" one of: {', '.join(spec.labels[:10])}"
+        field_lines.append(line)
+    output_schema = schema.output_schema(list(errors))
+    for fid in errors:
+        if schema.by_id(fid) is None:           # core field missing from the screen
+            output_schema["properties"][fid] = {"type": "string"}
+            output_schema["required"].append(fid)
+
+    return (
+        f"{issue_type.capitalize()} draft: {lookup.get('summary') or '(no summary)'}\n"
+        f"{description}\n\n"
+        "Problems found in the draft:\n" + "\n".join(f"- {msg}" for msg in errors.values()) + "\n\n"
+        "Field requirements:\n" + "\n".join(field_lines) + "\n\n"
+        f"JSON schema of the answer:\n{json.dumps(output_schema, separators=(',', ':'))}\n\n"
+        f"Return a JSON object with only the keys in Field requirements"
+    )
+
+
+def merge_repair(
+    schema: FieldSchema,
+    draft: Dict[str, Any],
+    patch: Dict[str, Any],
+    field_ids: Iterable[str],
+) -> Dict[str, Any]:
+    """``draft`` with the repaired fields replaced by ``patch``; anything else
+    the patch contains is ignored."""
+    field_ids = set(field_ids)
+
+    def field_id(key: str) -> str | None:
+        spec = schema.lookup(key)
+        return spec.id if spec is not None else (canonical(key) if canonical(key) in _CORE_FIELDS else None)
+
+    merged = {k: v for k, v in draft.items() if field_id(k) not in field_ids}
+    filled: set = set()
+    for key, value in patch.items():
+        fid = field_id(key)
+        if fid in field_ids and fid not in filled:      # first spelling of a field wins
+            merged[key] = value
+            filled.add(fid)
+    return merged
+
+
+def map_with_repair(
+    handler: EpicCreationHandler,
+    llm_service: LLMService,
+    draft: Dict[str, Any],
+    field_requirements: Dict[str, Any],
+    account_id: str | None,
+    max_rounds: int | None = None,
+    issue_type: str = "epic",
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    ``handler.map_fields`` with up to ``max_rounds`` targeted repairs (default
+    ``EPIC_CREATOR_REPAIR_ROUNDS``, 1). Returns
+    ``(mapped fields, repaired draft)``; raises the last ``FieldValidationError``
+    if the draft still does not validate (or names fields the LLM cannot fix).
+    """
+    schema = FieldSchema.of(field_requirements)
+    if max_rounds is None:
+        max_rounds = default_repair_rounds()
+    for attempt in range(max_rounds):
+        try:
+            return handler.map_fields(draft, schema, account_id), draft
+        except FieldValidationError as exc:
+            if not repairable(schema, exc.errors):
+                raise
+            prompt = build_repair_prompt(schema, draft, exc.errors, issue_type)
+            with span("repair", fields=len(exc.errors), round=attempt + 1,
+                      tokens=count_tokens(prompt, llm_service.model_name)):
+                log.info("repairing %s: %s", ", ".join(exc.errors), exc)
+                patch = llm_service.repair_fields(prompt)
+            draft = merge_repair(schema, draft, dict(patch or {}), exc.errors)
+    return handler.map_fields(draft, schema, account_id), draft
+
+
+def map_many_with_repair(
+    handler: EpicCreationHandler,
+    llm_service: LLMService,
+    drafts: List[Dict[str, Any]],
+    field_requirements: Dict[str, Any],
+    account_id: str | None,
+    max_rounds: int | None = None,
+    issue_type: str = "epic",
+    max_concurrency: int = 8,
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]] | Exception]:
+    """
+    ``map_with_repair`` for drafts sharing one set of field requirements: each
+    round the repair prompts of every failing draft go out in a single
+    ``generate_many`` batch. A draft that still does not validate, or whose
+    repair call failed, yields its exception in place of the pair.
+    """
+    schema = FieldSchema.of(field_requirements)
+    if max_rounds is None:
+        max_rounds = default_repair_rounds()
+    results: List[Any] = [None] * len(drafts)
+    drafts = list(drafts)
+    pending = list(range(len(drafts)))
+    for attempt in range(max_rounds + 1):
+        failing: Dict[int, Dict[str, str]] = {}
+        for i in pending:
+            try:
+                results[i] = handler.map_fields(drafts[i], schema, account_id), drafts[i]
+            except FieldValidationError as exc:
+                results[i] = exc
+                if attempt < max_rounds and repairable(schema, exc.errors):
+                    failing[i] = exc.errors
+            except Exception as exc:
+                results[i] = exc
+        if not failing:
+            break
+        prompts = [build_repair_prompt(schema, drafts[i], errors, issue_type) for i, errors in failing.items()]
+        with span("repair", drafts=len(prompts), fields=sum(map(len, failing.values())), round=attempt + 1,
+                  tokens=sum(count_tokens(p, llm_service.model_name) for p in prompts)):
+            log.info("repairing %d %s drafts", len(prompts), issue_type)
+            patches = llm_service.generate_many(prompts, max_concurrency=max_concurrency, cached=False)
+        pending = []
+        for (i, errors), patch in zip(failing.items(), patches):
+            if isinstance(patch, Exception):
+                results[i] = patch
+                continue
+            drafts[i] = merge_repair(schema, drafts[i], dict(patch or {}), errors)
+            pending.append(i)
+    return results
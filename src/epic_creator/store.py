@@ -0,0 +1,85 @@
+###############################################################################
+# Local SQLite key/value store                                                #
+###############################################################################
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Tuple
+
+
+def default_cache_dir() -> Path:
+    """Directory for on-disk caches (override with ``EPIC_CREATOR_CACHE_DIR``)."""
+    env = os.environ.get("EPIC_CREATOR_CACHE_DIR")
+    return Path(env) if env else Path.home() / ".cache" / "epic_creator"
+
+
+class SqliteKV:
+    """JSON values in a single SQLite table; one connection shared across threads."""
+
+    def __init__(self, path: str | Path, table: str = "kv"):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Tuple[Any, float] | None:
+        """Return ``(value, stored_at)`` or ``None``."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: Any, stored_at: float | None = None) -> None:
+        stored_at = time.time() if stored_at is None else stored_at
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> None:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",)
+            )
+
+    def prune(self, keep: int) -> None:
+        """Keep only the ``keep`` most recently stored rows."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key NOT IN "
+                f"(SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT ?)",
+                (keep,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute(f"SELECT key FROM {self.table}")]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
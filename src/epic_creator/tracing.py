@@ -0,0 +1,297 @@
+###############################################################################
+# Lightweight tracing: spans → pluggable sinks                                #
+###############################################################################
+"""
+``with span("jira.request", method="GET") as s: ... s.set(status=200)``
+
+Nothing is recorded until a sink is installed with ``set_sink``; until then
+``span`` hands back a shared no-op object, so instrumented code pays one
+global lookup per call.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Protocol, TextIO, Tuple
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "duration", "error", "parent")
+
+    def __init__(self, name: str, attrs: Dict[str, Any], parent: "Span | None"):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.start = time.time()
+        self.duration = 0.0
+        self.error: str | None = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "error": self.error,
+            **self.attrs,
+        }
+
+
+class Sink(Protocol):
+    def emit(self, span: Span) -> None: ...
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_sink: Sink | None = None
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar("epic_creator_span", default=None)
+
+
+class _ActiveSpan:
+    __slots__ = ("span", "sink", "token", "t0")
+
+    def __init__(self, sink: Sink, name: str, attrs: Dict[str, Any]):
+        self.sink = sink
+        self.span = Span(name, attrs, _current.get())
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        self.t0 = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.span.duration = time.perf_counter() - self.t0
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        try:
+            _current.reset(self.token)
+        except ValueError:                                 # exited from another context (generator in a thread)
+            pass
+        try:
+            self.sink.emit(self.span)
+        except Exception:                                  # a broken sink must not break a request
+            logging.getLogger(__name__).exception("trace sink failed")
+
+
+def span(name: str, **attrs: Any):
+    """Context manager yielding a ``Span`` (or a no-op stand-in when tracing is off)."""
+    sink = _sink
+    if sink is None:
+        return _NOOP
+    return _ActiveSpan(sink, name, attrs)
+
+
+def set_sink(sink: Sink | None) -> Sink | None:
+    """Install ``sink`` (``None`` disables tracing); returns the previous one."""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+# point-in-time values (queue depth, active slots) read when metrics are rendered
+_gauges: List[Callable[[], Iterable[Tuple[str, Dict[str, Any], float]]]] = []
+
+
+def register_gauge(collect: Callable[[], Iterable[Tuple[str, Dict[str, Any], float]]]) -> None:
+    """``collect()`` yields ``(metric, labels, value)``; ``PrometheusSink.render`` calls it."""
+    _gauges.append(collect)
+
+
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]+-\d+$")
+_PROJECT_KEY = re.compile(r"^[A-Z][A-Z0-9_]+$")
+
+
+def path_template(path: str) -> str:
+    """``/rest/api/3/issue/createmeta/PROJ/issuetypes/10000`` → ``…/{project}/issuetypes/{id}``."""
+    parts: List[str] = []
+    for seg in path.split("/"):
+        if seg.isdigit() and parts and parts[-1] != "api":        # keep /rest/api/3
+            seg = "{id}"
+        elif _ISSUE_KEY.match(seg):
+            seg = "{issue}"
+        elif _PROJECT_KEY.match(seg):
+            seg = "{project}"
+        parts.append(seg)
+    return "/".join(parts)
+
+
+# ───────────────────────────── sinks ──────────────────────────────────────
+class InMemorySink:
+    """Keeps every span; meant for tests and benchmarks."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def named(self, name: str) -> List[Span]:
+        with self._lock:
+            return [s for s in self.spans if s.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JsonLogSink:
+    """One JSON object per line, to a stream (default stderr) or a logger."""
+
+    def __init__(self, stream: TextIO | None = None, logger: logging.Logger | None = None):
+        self.stream = stream if stream is not None or logger is not None else sys.stderr
+        self.logger = logger
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        if self.logger is not None:
+            self.logger.info(line)
+        else:
+            with self._lock:
+                self.stream.write(line + "\n")
+                self.stream.flush()
+
+
+class PrometheusSink:
+    """
+    Aggregates spans into ``epic_creator_span_seconds`` histograms labelled by
+    span name plus the low-cardinality attributes in ``label_attrs``.
+    ``render()`` returns the text exposition format; ``serve(port)`` exposes it.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, label_attrs: Tuple[str, ...] = ("method", "path", "status", "model", "stage",
+                                                       "resource", "outcome")):
+        self.label_attrs = label_attrs
+        self._lock = threading.Lock()
+        self._hist: Dict[Tuple, List[float]] = {}
+        self._sum: Dict[Tuple, float] = defaultdict(float)
+        self._count: Dict[Tuple, int] = defaultdict(int)
+        self._errors: Dict[Tuple, int] = defaultdict(int)
+        self._counters: Dict[Tuple, float] = defaultdict(float)     # retries, bytes, tokens
+
+    def emit(self, span: Span) -> None:
+        labels = (("span", span.name),) + tuple(
+            (k, str(span.attrs[k])) for k in self.label_attrs if k in span.attrs
+        )
+        with self._lock:
+            buckets = self._hist.setdefault(labels, [0] * len(self.BUCKETS))
+            for i, bound in enumerate(self.BUCKETS):
+                if span.duration <= bound:
+                    buckets[i] += 1
+            self._sum[labels] += span.duration
+            self._count[labels] += 1
+            if span.error:
+                self._errors[labels] += 1
+            for attr in ("retries", "bytes", "prompt_tokens", "completion_tokens", "cached_tokens"):
+                value = span.attrs.get(attr)
+                if isinstance(value, (int, float)):
+                    self._counters[(attr,) + labels] += value
+
+    @staticmethod
+    def _fmt(labels: Tuple, extra: str = "") -> str:
+        inner = ",".join(f'{k}="{v}"' for k, v in labels)
+        if extra:
+            inner = f"{inner},{extra}" if inner else extra
+        return "{" + inner + "}"
+
+    def render(self) -> str:
+        out = ["# TYPE epic_creator_span_seconds histogram"]
+        with self._lock:
+            for labels, buckets in sorted(self._hist.items()):
+                for bound, n in zip(self.BUCKETS, buckets):
+                    le = self._fmt(labels, 'le="%s"' % bound)
+                    out.append(f"epic_creator_span_seconds_bucket{le} {n}")
+                le = self._fmt(labels, 'le="+Inf"')
+                out.append(f"epic_creator_span_seconds_bucket{le} {self._count[labels]}")
+                out.append(f"epic_creator_span_seconds_sum{self._fmt(labels)} {self._sum[labels]:.6f}")
+                out.append(f"epic_creator_span_seconds_count{self._fmt(labels)} {self._count[labels]}")
+            out.append("# TYPE epic_creator_span_errors_total counter")
+            for labels, n in sorted(self._errors.items()):
+                out.append(f"epic_creator_span_errors_total{self._fmt(labels)} {n}")
+            for (attr, *labels), v in sorted(self._counters.items()):
+                out.append(f"epic_creator_span_{attr}_total{self._fmt(tuple(labels))} {v:g}")
+        for collect in list(_gauges):
+            try:
+                for metric, labels, value in collect():
+                    out.append(f"epic_creator_{metric}{self._fmt(tuple(sorted(labels.items())))} {value:g}")
+            except Exception:                              # same rule as sinks: never break /metrics
+                logging.getLogger(__name__).exception("gauge collection failed")
+        return "\n".join(out) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = sink.render().encode()
+                self.send_response(200 if self.path.startswith("/metrics") else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+def configure_from_env() -> Sink | None:
+    """
+    ``EPIC_CREATOR_TRACE`` = comma list of ``json`` (stderr) and/or
+    ``prometheus[:port]`` (default 9464). Unset → tracing stays off.
+    """
+    sinks: List[Sink] = []
+    for item in filter(None, (s.strip() for s in os.getenv("EPIC_CREATOR_TRACE", "").split(","))):
+        kind, _, arg = item.partition(":")
+        if kind == "json":
+            sinks.append(JsonLogSink())
+        elif kind == "prometheus":
+            prom = PrometheusSink()
+            prom.serve(int(arg or 9464))
+            sinks.append(prom)
+    if sinks:
+        set_sink(sinks[0] if len(sinks) == 1 else MultiSink(*sinks))
+    return _sink
+
+
+class MultiSink:
+    def __init__(self, *sinks: Sink):
+        self.sinks = sinks
+
+    def emit(self, span: Span) -> None:
+        for sink in self.sinks:
+            sink.emit(span)
@@ -58,22 +58,30 @@ Streamlit UI for ai-epic-creator
 
 from __future__ import annotations
 
-import datetime, json
+import datetime, json, uuid
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
 import streamlit as st
-from dotenv import load_dotenv, find_dotenv
 
-# 1️⃣  Load .env so JiraClient gets credentials
-load_dotenv(find_dotenv())
+# 1️⃣  Load .env so JiraClient gets credentials (nothing is read on import any more)
+from epic_creator.config import load_config
+load_config()
 
 # 2️⃣  Import your package
-from epic_creator.jiraClient          import JiraClient
+from epic_creator.jiraClient          import get_default_client
+from epic_creator.orchestrator        import stream_draft
 from epic_creator.services.field_meta import FieldMetadataService
+from epic_creator.services.metadata_cache import get_default_cache
 from epic_creator.services.context    import FeatureContextService
-from epic_creator.services.llm        import LLMService
+from epic_creator.services.epic_index import default_registry
 from epic_creator.services.epic_handler import EpicCreationHandler
+from epic_creator.services.field_schema import FieldSchema, FieldValidationError
+from epic_creator.jobs import get_default_job_service
+from epic_creator.services.prefetch import start_from_env
+from epic_creator.decompose import STORY_TYPE
+from epic_creator.scheduler import Overloaded, set_user
+from epic_creator import tracing
 
 
 # ─────────────────────────────────────────────────────────────────────
@@ -83,28 +91,33 @@ def canon(name: str) -> str:
     return name.lower().replace(" ", "")
 
 
-def generate_draft(project_key: str, manager_prompt: str) -> tuple[dict, dict]:
-    """Return (draft_json, field_meta) but DOES NOT push to Jira"""
-    jira = st.session_state["jira"]
+@st.cache_resource
+def _tracing_sink():
+    # once per process: Streamlit reruns this file on every interaction
+    return tracing.configure_from_env()
 
-    fm     = FieldMetadataService(jira)
-    meta   = fm.get_epic_fields(project_key)
 
-    ctx    = FeatureContextService(jira)
-    proj   = ctx.get_project_overview(project_key)
-    recent = ctx.get_recent_epics(project_key)
+@st.cache_resource
+def _metadata_prefetcher():
+    # EPIC_CREATOR_PREFETCH_PROJECTS=PROJ,OTHER keeps their metadata hot for every session
+    return start_from_env(get_default_client())
 
-    llm    = LLMService()
-    prompt = llm.build_prompt(meta, proj, recent, manager_prompt)
-    draft  = llm.generate_epic(prompt)          # dict
 
-    return draft, meta
+def generate_draft(project_key: str, manager_prompt: str, regenerate: bool = False) -> tuple[Iterator[dict], dict]:
+    """Return (stream of partial drafts, field_meta) but DOES NOT push to Jira"""
+    jira = st.session_state["jira"]
+    drafts, meta, prompt = stream_draft(jira, project_key, manager_prompt, regenerate=regenerate)
+    st.caption(f"Prompt: {prompt.tokens} / {prompt.budget} tokens "
+               f"(stable prefix {prompt.prefix_tokens}, v{prompt.prefix_version})")
+    return drafts, meta
 
 
 # ─────────────────────────────────────────────────────────────────────
 # Streamlit UI
 # ─────────────────────────────────────────────────────────────────────
 st.set_page_config(page_title="AI Epic Creator", page_icon="🦾", layout="wide")
+_tracing_sink()
+_metadata_prefetcher()
 st.title("🦾 AI-Assisted Epic Creator")
 
 with st.sidebar:
@@ -112,24 +125,50 @@ with st.sidebar:
     project_key = st.text_input("Project Key", "JIRADEMO")
     manager_prompt = st.text_area("Manager Prompt", height=150, key="prompt")
     generate_btn = st.button("Generate Draft")
+    regen_btn    = st.button("Regenerate (skip cache)")
+    refresh_btn  = st.button("Refresh field metadata")
 
-# Session-state setup
+# Session-state setup: the client (and its connection pool / accountId) is shared per process
 if "jira" not in st.session_state:
-    st.session_state["jira"] = JiraClient()      # creds via .env
-
-if generate_btn:
+    st.session_state["jira"] = get_default_client()      # creds via .env
+if "user" not in st.session_state:
+    st.session_state["user"] = uuid.uuid4().hex[:12]
+# Jira / LLM calls queue fairly per browser session (reruns start on a fresh thread)
+set_user(st.session_state["user"])
+
+if refresh_btn:
+    base_url = st.session_state["jira"].base_url
+    get_default_cache().invalidate(base_url, project_key)
+    get_default_cache().invalidate(base_url, FieldMetadataService.issue_type_key(project_key, STORY_TYPE))
+    get_default_cache().invalidate(base_url, FeatureContextService.overview_key(project_key))
+    default_registry.invalidate(base_url, project_key)
+    st.info(f"Field metadata (Epic + Story), project info and epic index cleared for {project_key}")
+
+if generate_btn or regen_btn:
     try:
-        draft, meta = generate_draft(project_key, manager_prompt)
+        drafts, meta = generate_draft(project_key, manager_prompt, regenerate=regen_btn)
+
+        # render summary + description while tokens are still arriving
+        summary_box, description_box = st.empty(), st.empty()
+        draft: Dict[str, Any] = {}
+        for draft in drafts:
+            summary_box.markdown(f"### {draft.get('summary', '')}")
+            description_box.markdown(draft.get("description", ""))
+        summary_box.empty(); description_box.empty()
+
         st.session_state["draft"] = draft
         st.session_state["meta"]  = meta
+        st.session_state["idempotency_key"] = uuid.uuid4().hex   # one epic per draft, however often submit is hit
         st.success("Draft generated – edit below ⬇️")
+    except Overloaded as e:
+        st.warning(f"Too busy right now ({e.resource}) – please retry in a moment.")
     except Exception as e:
         st.error(f"Generation failed: {e}")
 
 # ───────────────────────── form appears after draft is in session ───
 if "draft" in st.session_state:
     draft: Dict[str, Any] = st.session_state["draft"]
-    meta : Dict[str, Any] = st.session_state["meta"]
+    meta : FieldSchema    = st.session_state["meta"]     # compiled: O(1) id → name lookups
 
     st.subheader("📝 Review & Edit Draft")
 
@@ -138,7 +177,7 @@ if "draft" in st.session_state:
 
         # existing fields
         for fid, value in draft.items():
-            h_name = next((n for n, m in meta.items() if m["id"] == fid), fid)
+            h_name = meta.name_of(fid)
             schema = meta.get(h_name, {}).get("schema", {})
             allowed = meta.get(h_name, {}).get("allowed")
 
@@ -172,17 +211,31 @@ if "draft" in st.session_state:
                 edited[fid] = w_val
 
         jira      = st.session_state["jira"]
-        fm        = FieldMetadataService(jira)
+        fm        = FieldMetadataService(jira, cache=get_default_cache())
         handler   = EpicCreationHandler(jira, fm)
-        accountId = fm.get_user_id()
+        accountId = jira.account_id()              # one GET per process, not per submit
 
         try:
             mapped  = handler.map_fields(edited, meta, accountId)
-            key     = handler.create_epic(project_key, mapped)
-            url     = f"{jira.base_url}/browse/{key}"
-            st.success(f"✅ Epic {key} created!")
-            st.markdown(f"[Open in Jira]({url})")
-            st.balloons()
-            del st.session_state["draft"]     # clear after success
+            jobs    = get_default_job_service()
+            job_id  = jobs.submit_create(project_key, st.session_state["idempotency_key"], fields=mapped)
+            with st.spinner("Creating epic…"):
+                job = jobs.wait(job_id, timeout=60)
+            if job.status == "failed":
+                raise RuntimeError(job.error)
+            if not job.done:
+                st.info(f"Still creating (job {job_id}); submitting again will not create a duplicate.")
+            else:
+                key = job.result["key"]
+                url = f"{jira.base_url}/browse/{key}"
+                st.success(f"✅ Epic {key} created!")
+                st.markdown(f"[Open in Jira]({url})")
+                st.balloons()
+                del st.session_state["draft"]     # clear after success
+        except FieldValidationError as e:    # caught locally, nothing was sent
+            for msg in e.errors.values():
+                st.error(msg)
+        except Overloaded as e:
+            st.warning(f"Too busy right now ({e.resource}) – please retry in a moment.")
         except Exception as e:
             st.error(f"Push failed: {e}")
\ No newline at end of file
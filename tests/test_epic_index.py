@@ -0,0 +1,52 @@
+from epic_creator.services.epic_index import EpicIndex
+
+
+def epic(key, summary, description="", labels=(), updated="2026-01-01T00:00:00.000+0000"):
+    return {"key": key, "fields": {"summary": summary, "description": description,
+                                   "labels": list(labels), "updated": updated}}
+
+
+EPICS = [
+    epic("P-1", "Export invoices as PDF", "Billing users download invoices"),
+    epic("P-2", "Single sign-on with Okta", "SAML login for enterprise tenants", ["auth"]),
+    epic("P-3", "Dark mode", "Theme switcher for the web app"),
+]
+
+
+def keys(docs):
+    return [d["key"] for d in docs]
+
+
+def test_search_ranks_by_similarity():
+    index = EpicIndex()
+    index.upsert(EPICS)
+    assert keys(index.search("invoice PDF export for billing", k=1)) == ["P-1"]
+    assert keys(index.search("okta saml login", k=2))[0] == "P-2"
+    assert len(index.search("anything", k=10)) == 3
+
+
+def test_upsert_replaces_an_epic_and_its_document_frequencies():
+    index = EpicIndex()
+    index.upsert(EPICS)
+    index.search("warm the compiled matrix")
+    index.upsert([epic("P-3", "Okta group sync", "Provision users from okta groups",
+                       updated="2026-02-01T00:00:00.000+0000")])
+    assert len(index) == 3
+    assert keys(index.search("okta group provisioning", k=1)) == ["P-3"]
+    assert index.watermark == "2026-02-01T00:00:00.000+0000"
+    fresh = EpicIndex()
+    fresh.upsert([EPICS[0], EPICS[1], epic("P-3", "Okta group sync", "Provision users from okta groups")])
+    assert (fresh._df == index._df).all()
+
+
+def test_rows_are_sparse():
+    index = EpicIndex()
+    index.upsert(EPICS)
+    assert all(len(ids) == len(tf) < 50 for ids, tf in zip(index._ids, index._tf))
+
+
+def test_empty_text_and_empty_index():
+    index = EpicIndex()
+    assert index.search("anything") == []
+    index.upsert([{"key": "E-1", "fields": {}}])
+    assert keys(index.search("")) == ["E-1"]
@@ -0,0 +1,18 @@
+import os
+
+import pytest
+from import_budget import BUDGETS, measure
+
+RUNS = 3
+SCALE = float(os.environ.get("EPIC_CREATOR_IMPORT_BUDGET_SCALE", 1.0))   # slower CI machines
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_stays_within_budget(module):
+    budget, forbidden = BUDGETS[module]
+    samples = [measure(module) for _ in range(RUNS)]
+
+    leaked = sorted(f for f in forbidden if any(f in modules for _, modules in samples))
+    assert not leaked, f"{module} pulls in {', '.join(leaked)}"
+    best = min(ms for ms, _ in samples)
+    assert best <= budget * SCALE, f"{module} imports in {best:.1f} ms, budget {budget * SCALE:.0f} ms"
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from epic_creator.jiraClient import iter_json_array
+
+# numbers with fractions / exponents, escapes, surrogate pairs, multi-byte UTF-8, nesting
+PAYLOAD = (
+    '[1500.5, -12e3, 0.25E-2, 7, true, null, "a\\"b\\\\c", "\\u00e9t\\u00e9 \\ud83d\\ude80", '
+    '"naïve – ✓", {"id": "customfield_10011", "schema": {"type": "number"}, "n": 3.0}, [], '
+    '[1, [2, {"k": [false]}]], 42]'
+).encode("utf-8")
+
+
+def split(data: bytes, *cuts: int):
+    bounds = (0, *cuts, len(data))
+    return [data[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize("cut", range(1, len(PAYLOAD)))
+def test_every_two_chunk_boundary(cut):
+    assert list(iter_json_array(split(PAYLOAD, cut))) == json.loads(PAYLOAD)
+
+
+def test_one_byte_chunks():
+    chunks = [PAYLOAD[i:i + 1] for i in range(len(PAYLOAD))]
+    assert list(iter_json_array(chunks)) == json.loads(PAYLOAD)
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([b"[1500.", b"5]"], [1500.5]),
+    ([b"[12e", b"3]"], [12e3]),
+    ([b"[12", b"e", b"-", b"3, 4]"], [12e-3, 4]),
+    ([b"[-", b"1]"], [-1]),
+    ([b'["a\\', b'"b"]'], ['a"b']),
+    ([b'["\\u00', b'e9"]'], ["é"]),
+    ([b'["\xc3', b'\xa9"]'], ["é"]),
+    ([b"[1", b"", b"2]"], [12]),
+    ([b"[tr", b"ue,fal", b"se]"], [True, False]),
+    ([b"  [ ", b"] "], []),
+])
+def test_boundaries_inside_values(chunks, expected):
+    assert list(iter_json_array(chunks)) == expected
+
+
+def test_number_at_end_of_stream_is_complete():
+    assert list(iter_json_array([b"[1, 2", b"5]"])) == [1, 25]
+
+
+@pytest.mark.parametrize("chunks, message", [
+    ([b"[1, 2"], "truncated"),
+    ([b'{"a": 1}'], "expected a JSON array"),
+    ([b"[1 2]"], "unexpected"),
+])
+def test_malformed(chunks, message):
+    with pytest.raises(ValueError, match=message):
+        list(iter_json_array(chunks))
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from epic_creator import jiraClient
+from epic_creator.jiraClient import JiraClient, JiraError
+from epic_creator.scheduler import Scheduler
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"[]"):
+        self.status_code = status
+        self.ok = status < 400
+        self.headers = {"Retry-After": "0"} if status == 503 else {}
+        self.text = body.decode()
+        self.content = body
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from (self.content[i:i + chunk_size] for i in range(0, len(self.content), chunk_size))
+
+    def close(self):
+        self.closed = True
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, **kwargs):
+        self.sent.append(self.responses.pop(0))
+        return self.sent[-1]
+
+    def request(self, method, url, **kwargs):
+        return self.get(url, **kwargs)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = JiraClient("https://jira.test", "a@b", "t", scheduler=Scheduler({"jira": 1}))
+    limiter = client.scheduler.limiters["jira"]
+    active_in_backoff = client.active_in_backoff = []
+
+    def no_wait(retry_state):
+        active_in_backoff.append(limiter.stats()["active"])
+        return 0
+
+    monkeypatch.setattr(jiraClient, "_wait_retry_after", no_wait)
+    return client
+
+
+def active(client):
+    return client.scheduler.limiters["jira"].stats()["active"]
+
+
+def test_iter_array_releases_the_slot_during_backoff(client):
+    client.session = FakeSession(FakeResponse(503), FakeResponse(502), FakeResponse(200, b'[1, {"a": 2}, 3]'))
+    items = client.iter_array("/rest/api/2/field", chunk_size=4)
+    assert next(items) == 1
+    assert client.active_in_backoff == [0, 0]
+    assert active(client) == 1                       # held while the body is read
+    assert list(items) == [{"a": 2}, 3]
+    assert active(client) == 0
+    assert all(r.closed for r in client.session.sent)
+
+
+def test_iter_array_closed_early_releases_slot_and_connection(client):
+    client.session = FakeSession(FakeResponse(200, b"[1, 2, 3]"))
+    items = client.iter_array("/rest/api/2/field")
+    assert next(items) == 1
+    items.close()
+    assert active(client) == 0 and client.session.sent[0].closed
+
+
+def test_iter_array_gives_up_after_three_attempts(client):
+    client.session = FakeSession(*(FakeResponse(503) for _ in range(3)))
+    with pytest.raises(JiraError):
+        list(client.iter_array("/rest/api/2/field"))
+    assert client.active_in_backoff and set(client.active_in_backoff) == {0}
+    assert active(client) == 0
+
+
+def test_request_releases_the_slot_during_backoff(client):
+    client.session = FakeSession(FakeResponse(503), FakeResponse(200, b'{"ok": true}'))
+    assert client.get("/rest/api/2/myself") == {"ok": True}
+    assert client.active_in_backoff == [0]
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from fake_llm import FakeEpicChatModel
+
+from epic_creator.scheduler import Scheduler
+from epic_creator.services.llm import LLMService
+from epic_creator.services.llm_router import LLMRouteError, ModelRoute, ModelRouter
+
+PROMPT = "Field requirements:\n* Summary (required=True)\n\nNew epic requirement: export invoices as PDF"
+
+
+class FailingChatModel(FakeEpicChatModel):
+    def _generate(self, *args, **kwargs):
+        raise ConnectionError("model unavailable")
+
+    def _stream(self, *args, **kwargs):
+        raise ConnectionError("model unavailable")
+        yield
+
+
+def fast(**kwargs) -> FakeEpicChatModel:
+    return FakeEpicChatModel(delay=0.01, first_token_delay=0.0, **kwargs)
+
+
+def service(*routes: ModelRoute, **router_kwargs) -> LLMService:
+    router = ModelRouter(list(routes), scheduler=Scheduler({}), **router_kwargs)
+    return LLMService(router=router)
+
+
+def wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("primary", [fast(garbage_rate=1.0), FailingChatModel(delay=0.0)])
+def test_invoke_falls_back_to_the_next_route(primary):
+    llm = service(ModelRoute("a", primary), ModelRoute("b", fast()), hedge=False)
+    assert llm.generate_epic(PROMPT)["Summary"] == "export invoices as PDF"
+    stats = llm.router.stats()
+    assert (stats["a"]["failed"], stats["b"]["won"]) == (1, 1)
+
+
+def test_all_routes_failing_raises_route_error():
+    llm = service(ModelRoute("a", FailingChatModel()), ModelRoute("b", fast(garbage_rate=1.0)), hedge=False)
+    with pytest.raises(LLMRouteError) as err:
+        llm.generate_epic(PROMPT)
+    assert [e.split(":")[0] for e in err.value.errors] == ["a", "b"]
+
+
+def test_hedge_fires_after_delay_and_first_answer_wins():
+    slow = FakeEpicChatModel(delay=0.01, tail_rate=1.0, tail_delay=0.5)
+    llm = service(ModelRoute("a", slow), ModelRoute("b", fast()), hedge_delay=0.05)
+    start = time.perf_counter()
+    assert llm.generate_epic(PROMPT)["Summary"] == "export invoices as PDF"
+    assert time.perf_counter() - start < 0.4
+    wait_for(lambda: llm.router.stats()["a"]["lost"] == 1)
+    stats = llm.router.stats()
+    assert (stats["a"]["lost"], stats["b"]["won"]) == (1, 1)
+
+
+def test_no_hedge_before_delay():
+    llm = service(ModelRoute("a", fast()), ModelRoute("b", fast()), hedge_delay=1.0)
+    llm.generate_epic(PROMPT)
+    assert llm.router.stats()["b"] == {"won": 0, "lost": 0, "failed": 0, "timeout": 0}
+
+
+def test_timeout_starts_next_route_and_is_counted_once():
+    slow = FakeEpicChatModel(delay=0.3)
+    llm = service(ModelRoute("a", slow, timeout=0.05), ModelRoute("b", fast()), hedge=False)
+    assert llm.generate_epic(PROMPT)["Summary"] == "export invoices as PDF"
+    time.sleep(0.4)                                     # let the abandoned attempt finish
+    stats = llm.router.stats()
+    assert {k: stats["a"][k] for k in ("won", "lost", "failed", "timeout")} == \
+        {"won": 0, "lost": 0, "failed": 0, "timeout": 1}
+    assert stats["b"]["won"] == 1
+
+
+@pytest.mark.parametrize("primary", [fast(garbage_rate=1.0), FailingChatModel(delay=0.0)])
+def test_stream_falls_back_when_primary_yields_no_object(primary):
+    llm = service(ModelRoute("a", primary), ModelRoute("b", fast()))
+    drafts = list(llm.stream_epic(PROMPT))
+    assert drafts and drafts[-1]["Summary"] == "export invoices as PDF"
+    stats = llm.router.stats()
+    assert (stats["a"]["failed"], stats["b"]["won"]) == (1, 1)
+
+
+def test_stream_all_routes_failing_raises_route_error():
+    llm = service(ModelRoute("a", fast(garbage_rate=1.0)), ModelRoute("b", FailingChatModel()))
+    with pytest.raises(LLMRouteError):
+        list(llm.stream_epic(PROMPT))
@@ -0,0 +1,70 @@
+from epic_creator.services.epic_handler import EpicCreationHandler
+from epic_creator.services.field_schema import FieldValidationError
+from epic_creator.services.repair import map_many_with_repair
+
+FIELDS = {
+    "Summary": {"id": "summary", "required": True, "schema": {"type": "string"}},
+    "Description": {"id": "description", "required": True, "schema": {"type": "string"}},
+    "Priority": {"id": "priority", "required": True, "schema": {"type": "priority"},
+                 "allowed": [{"id": "1", "name": "High"}, {"id": "2", "name": "Low"}]},
+}
+
+
+class BatchLLM:
+    """Answers repair prompts from ``patches`` in order; records every batch."""
+    model_name = "gpt-4o-mini"
+
+    def __init__(self, *patches):
+        self.patches = list(patches)
+        self.batches = []
+
+    def generate_many(self, prompts, max_concurrency=8, cached=True):
+        assert cached is False
+        self.batches.append(prompts)
+        return [self.patches.pop(0) for _ in prompts]
+
+
+def draft(summary, **extra):
+    return {"summary": summary, "description": "d", **extra}
+
+
+def run(llm, drafts, max_rounds=1):
+    return map_many_with_repair(EpicCreationHandler(None, None), llm, drafts, FIELDS, "acc",
+                                max_rounds=max_rounds, issue_type="story")
+
+
+def test_valid_drafts_need_no_llm_call():
+    llm = BatchLLM()
+    results = run(llm, [draft("a", priority="High"), draft("b", priority="Low")])
+    assert [r[0]["priority"] for r in results] == [{"id": "1"}, {"id": "2"}]
+    assert llm.batches == []
+
+
+def test_failing_drafts_are_repaired_in_one_batch():
+    llm = BatchLLM({"Priority": "Low"}, {"Priority": "High"})
+    results = run(llm, [draft("a", priority="Urgent"), draft("b", priority="High"), draft("c")])
+    assert len(llm.batches) == 1 and len(llm.batches[0]) == 2
+    assert [r[0]["priority"] for r in results] == [{"id": "2"}, {"id": "1"}, {"id": "1"}]
+    assert results[0][1]["Priority"] == "Low"
+
+
+def test_failed_repair_call_and_unfixed_draft_come_back_as_errors():
+    llm = BatchLLM(ConnectionError("model unavailable"), {"Priority": "Whatever"})
+    results = run(llm, [draft("a"), draft("b"), draft("c", priority="Low")])
+    assert isinstance(results[0], ConnectionError)
+    assert isinstance(results[1], FieldValidationError) and "priority" in results[1].errors
+    assert results[2][0]["priority"] == {"id": "2"}
+
+
+def test_each_round_is_one_batch():
+    llm = BatchLLM({"Priority": "Nope"}, {"Priority": "Nope"}, {"Priority": "Low"}, {"Priority": "Nope"})
+    results = run(llm, [draft("a"), draft("b")], max_rounds=2)
+    assert [len(b) for b in llm.batches] == [2, 2]
+    assert results[0][0]["priority"] == {"id": "2"}
+    assert isinstance(results[1], FieldValidationError)
+
+
+def test_no_rounds_means_no_repair():
+    llm = BatchLLM()
+    results = run(llm, [draft("a")], max_rounds=0)
+    assert isinstance(results[0], FieldValidationError) and llm.batches == []